@@ -4,12 +4,15 @@ import asyncio
 from typing import List, Dict, Tuple, Any
 from src.llm_integration import LLMClient
 from src.features.bulletproof_parser import parse_json_safely
+from src.features.response_cache import ResponseCache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
 class ClarificationAgent:
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, use_cache: bool = True):
         self.llm_client = llm_client
+        # Status verdicts are persisted across runs (disable with PROMPT_CACHE_DISABLE=1)
+        self.response_cache = ResponseCache.from_env() if use_cache else None
 
     async def analyze_status(self, intention: str, history: List[Dict[str, str]] = None) -> Dict[str, Any]:
         """
@@ -23,6 +26,17 @@ class ClarificationAgent:
         if turn_count >= 5:
             return {"status": "READY", "questions": [], "estimated_turns_remaining": 0, "rationale": "Max turns reached."}
 
+        # Low-temperature verdicts are reused for the same model, intention (modulo whitespace) and history
+        cache_key = None
+        if self.response_cache is not None:
+            model = str(getattr(self.llm_client, "default_model", ""))
+            cache_key = make_cache_key(
+                "analyze_status", model, " ".join(intention.split()), json.dumps(history_list, sort_keys=True)
+            )
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                return json.loads(cached)
+
         history_str = ""
         if history_list:
             history_str = "\n".join([f"Q: {item['q']}\nA: {item['a']}" for item in history_list])
@@ -66,12 +80,16 @@ CRITERIA FOR READY:
             estimated = data.get("estimated_turns_remaining", 1)
             
             # Ensure types are correct
-            return {
+            result = {
                 "status": str(status),
                 "questions": [str(q) for q in questions],
                 "estimated_turns_remaining": int(estimated),
                 "rationale": data.get("rationale", "")
             }
+            # Only well-formed verdicts are cached; defaults from an unparseable reply are retried next time
+            if cache_key and "status" in data:
+                await asyncio.to_thread(self.response_cache.set, cache_key, json.dumps(result))
+            return result
         except Exception as e:
             return {
                 "status": "REFINING", 
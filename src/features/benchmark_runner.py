@@ -1,11 +1,16 @@
+import re
 import time
 import json
 import os
 import uuid
+import asyncio
+import threading
 import subprocess
 from typing import List, Dict, Any, Optional
 from src.features.benchmark_variants import BENCHMARK_VARIANTS
 
+_JSON_BLOCK_RE = re.compile(r'(\{.*\})', re.DOTALL)
+
 class BenchmarkRunner:
     """
     Executes prompt-script variants using the Gemini CLI and collects high-fidelity metrics.
@@ -17,14 +22,49 @@ class BenchmarkRunner:
         # Hard limits to prevent dead loops - increased for deep reasoning
         self.MAX_TRIAL_TIMEOUT = 1200 # 20 minutes per trial
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
+        # Long-lived append handle shared by every trial of this runner
+        self._log_handle = None
+        # Trials may run concurrently in worker threads
+        self._log_lock = threading.Lock()
+        # Set by close(): in-flight trials stop waiting, kill their CLI process and log nothing more
+        self._stop = threading.Event()
 
     def log_result(self, result: Dict[str, Any]):
         try:
-            with open(self.output_file, "a") as f:
-                f.write(json.dumps(result) + "\n")
+            line = json.dumps(result) + "\n"
+            with self._log_lock:
+                if self._stop.is_set():
+                    return # Runner closed; late trials must not reopen the log
+                if self._log_handle is None:
+                    self._log_handle = open(self.output_file, "a")
+                self._log_handle.write(line)
+                self._log_handle.flush()
         except Exception as e:
             print(f"[!] Logging error: {e}")
 
+    def close(self):
+        """Stops in-flight trials and releases resources shared across trials."""
+        self._stop.set()
+        with self._log_lock:
+            if self._log_handle is not None:
+                self._log_handle.close()
+                self._log_handle = None
+
+    async def run_benchmark_trial_async(
+        self, 
+        variant_id: str, 
+        intention: str, 
+        context: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Dict[str, Any]:
+        """
+        Runs a trial in a worker thread so independent trials can overlap.
+        """
+        return await asyncio.to_thread(
+            self.run_benchmark_trial, variant_id, intention, context, temperature, max_tokens
+        )
+
     def run_benchmark_trial(
         self, 
         variant_id: str, 
@@ -53,7 +93,7 @@ class BenchmarkRunner:
         
         try:
             if self.mock:
-                time.sleep(0.5)
+                self._stop.wait(0.5)
                 output = f"MOCKED RESPONSE: {intention[:20]}"
                 success = True
             else:
@@ -78,19 +118,23 @@ class BenchmarkRunner:
                     if process.poll() is not None:
                         stdout, stderr = process.communicate()
                         break
-                    time.sleep(30)
+                    if self._stop.wait(30):
+                        break
                     elapsed += 30
                     print(f"      ... still reasoning ({elapsed}s)", flush=True)
                 
                 if process.poll() is None:
                     process.kill()
                     stdout, stderr = process.communicate()
-                    error_type = "Timeout"
-                    error_msg = f"Trial exceeded {self.MAX_TRIAL_TIMEOUT}s limit"
+                    if self._stop.is_set():
+                        error_type = "Cancelled"
+                        error_msg = "Runner closed before the trial finished"
+                    else:
+                        error_type = "Timeout"
+                        error_msg = f"Trial exceeded {self.MAX_TRIAL_TIMEOUT}s limit"
                 elif process.returncode == 0:
                     try:
-                        import re
-                        json_match = re.search(r'(\{.*\})', stdout, re.DOTALL)
+                        json_match = _JSON_BLOCK_RE.search(stdout)
                         if json_match:
                             parsed = json.loads(json_match.group(1))
                             output = parsed.get("response", stdout)
@@ -10,6 +10,8 @@ IGNORE_FILES = {
     ".DS_Store", "*.pyc", "*.pyo", "package-lock.json", "yarn.lock"
 }
 
+KEY_FILES = ["README.md", "requirements.txt", "pyproject.toml", "setup.py", "Dockerfile"]
+
 def scan_directory(root_path: str, max_depth: int = 3) -> str:
     """
     Generates a tree view of the directory structure.
@@ -17,10 +19,10 @@ def scan_directory(root_path: str, max_depth: int = 3) -> str:
     if not os.path.exists(root_path):
         return f"Error: Path '{root_path}' does not exist."
 
-    tree_str = f"Project Root: {os.path.basename(os.path.abspath(root_path))}\\n"
+    # Accumulate lines and join once instead of growing a string per entry
+    lines = [f"Project Root: {os.path.basename(os.path.abspath(root_path))}\\n"]
     
     def _walk(path: str, prefix: str = "", current_depth: int = 0):
-        nonlocal tree_str
         if current_depth > max_depth:
             return
 
@@ -37,23 +39,22 @@ def scan_directory(root_path: str, max_depth: int = 3) -> str:
             is_last = (i == len(entries) - 1)
             connector = "└── " if is_last else "├── "
             
-            tree_str += f"{prefix}{connector}{entry}\\n"
+            lines.append(f"{prefix}{connector}{entry}\\n")
             
             if os.path.isdir(full_path):
                 extension = "    " if is_last else "│   "
                 _walk(full_path, prefix + extension, current_depth + 1)
 
     _walk(root_path)
-    return tree_str
+    return "".join(lines)
 
 def read_key_files(root_path: str) -> Dict[str, str]:
     """
     Reads content of key files like README.md, requirements.txt, pyproject.toml
     """
-    key_files = ["README.md", "requirements.txt", "pyproject.toml", "setup.py", "Dockerfile"]
     found_content = {}
     
-    for filename in key_files:
+    for filename in KEY_FILES:
         path = os.path.join(root_path, filename)
         if os.path.exists(path):
             try:
@@ -3,6 +3,7 @@ import logging
 import asyncio
 from typing import List, Dict
 from src.llm_integration import LLMClient
+from src.features.response_cache import make_cache_key
 from src.features.file_interface import read_project_file
 from src.features.bulletproof_parser import parse_json_safely
 
@@ -15,6 +16,8 @@ class DiscoveryAgent:
     """
     def __init__(self, llm_client: LLMClient):
         self.llm_client = llm_client
+        # In-flight investigations keyed on their inputs: [task, number of waiting callers]
+        self._inflight: Dict[str, list] = {}
 
     async def discover_and_read_context(
         self, 
@@ -77,6 +80,33 @@ Select the most important files."""
         intention: str,
         tree_str: str,
         max_files: int = 15
+    ) -> str:
+        """
+        Concurrent calls with the same inputs share one investigation instead of
+        repeating the whole multi-agent pipeline. The shared run is cancelled only
+        once every caller waiting on it has been cancelled.
+        """
+        key = make_cache_key(root_path, intention, tree_str.strip(), str(max_files))
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._investigate(root_path, intention, tree_str, max_files))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+
+    async def _investigate(
+        self,
+        root_path: str,
+        intention: str,
+        tree_str: str,
+        max_files: int
     ) -> str:
         """
         Parallelized multi-agent investigation with Global Context:
@@ -92,9 +122,9 @@ Select the most important files."""
 
         # --- GLOBAL CONTEXT ACQUISITION ---
         anchor_files = [f for f in discovered_files.keys() if any(x in f.lower() for x in ["readme", "architecture", "design", "main", "requirements", "package.json"])]
-        global_context_snippet = ""
-        for af in anchor_files:
-            global_context_snippet += f"\n--- GLOBAL CONTEXT from {af} ---\n{discovered_files[af][:2000]}\n"
+        global_context_snippet = "".join(
+            f"\n--- GLOBAL CONTEXT from {af} ---\n{discovered_files[af][:2000]}\n" for af in anchor_files
+        )
 
         # Parallelized Analysis Phase (Multi-Agent Simulation)
         async def analyze_file(path: str, content: str) -> str:
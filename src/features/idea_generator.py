@@ -1,11 +1,24 @@
 import json
 import logging
-from typing import Dict, Any, Tuple, List
+from typing import TYPE_CHECKING, Dict, Any, Tuple, List
 from src.llm_integration import LLMClient
-from src.prompt_builder import PromptBuilder
+
+if TYPE_CHECKING:
+    # Annotation-only: avoid pulling the full builder graph in on import
+    from src.prompt_builder import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
+# Project context sent with every Evolve-tab call; truncated identically so the prefix stays byte-stable
+PROJECT_CONTEXT_LIMIT = 5000
+
+def _project_context_message(project_context: str) -> Dict[str, str]:
+    """
+    Leading system message shared by every idea call on the same scanned project.
+    It precedes the per-call instructions so providers can serve it from their prompt cache.
+    """
+    return {"role": "system", "content": f"PROJECT CONTEXT:\n{project_context[:PROJECT_CONTEXT_LIMIT]}"}
+
 async def generate_idea_questions(
     client: LLMClient,
     project_context: str,
@@ -36,9 +49,10 @@ Ask 3-4 strategic questions about:
 
 Respond ONLY with a JSON list of strings."""
 
-    user_content = f"CONTEXT:\n{project_context[:5000]}\n\n{choice.upper()} IDEA: {idea}"
+    user_content = f"{choice.upper()} IDEA: {idea}"
     
     messages = [
+        _project_context_message(project_context),
         {"role": "system", "content": system_instruction},
         {"role": "user", "content": user_content}
     ]
@@ -71,16 +85,16 @@ Suggest ONE sophisticated new feature or capability to add to this codebase.
 Focus on enhancing functionality or solving a core limitation.
 Return ONLY the description."""
 
-    user_content = f"CONTEXT:\n{project_context[:5000]}"
     messages = [
+        _project_context_message(project_context),
         {"role": "system", "content": system_instruction},
-        {"role": "user", "content": user_content}
+        {"role": "user", "content": "Suggest the idea for the project above."}
     ]
     return await client.agenerate_completion(messages, temperature=0.9)
 
 async def generate_idea_and_prompt(
     client: LLMClient,
-    builder: PromptBuilder,
+    builder: "PromptBuilder",
     project_context: str,
     choice: str,
     idea: str,
@@ -1,25 +1,12 @@
+import asyncio
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from src.llm_integration import LLMClient
+from src.features.bulletproof_parser import parse_json_safely
 
 logger = logging.getLogger(__name__)
 
-class PromptOptimizer:
-    def __init__(self, llm_client: LLMClient):
-        self.llm_client = llm_client
-
-    async def optimize_prompt(
-        self, 
-        raw_prompt: str, 
-        mode: str, 
-        intention: str
-    ) -> str:
-        """
-        Uses an LLM to refine and expand the mechanically generated prompt into a 
-        high-quality, long-form prompt designed for deep reasoning.
-        """
-        
-        system_instructions = """You are an expert Prompt Engineer and Senior Software Architect. 
+SYSTEM_INSTRUCTIONS = """You are an expert Prompt Engineer and Senior Software Architect. 
 Your goal is to transform a technical prompt into an elite-level directive that is highly detailed but remains focused and avoids unnecessary wordiness.
 
 CRITICAL GUIDELINES:
@@ -34,31 +21,67 @@ CRITICAL GUIDELINES:
 4. **FORCE DEEP THINKING**: Retain the mandatory <thinking> process but keep it focused on the immediate implementation path.
 """
 
-        user_content = f"""
+# Static development-method requirements. Kept in the system message (not the per-call user
+# message) so every optimizer request shares one identical prefix for provider-side caching.
+DEVELOPMENT_METHOD_REQUIREMENTS = """
+DEVELOPMENT METHOD REQUIREMENTS (incorporate into every rewritten prompt):
+1) write unit tests for the program.
+2) write necessary comments.
+3) For every module built, do a pilot run, get report/feedback, and refine.
+4) Include a formal EVALUATION & BENCHMARKING section with specific metrics (e.g., latency, throughput, energy efficiency, or formal proof goals).
+
+Make the prompt feel like a high-level research directive from a lead scientist.
+"""
+
+OPTIMIZER_SYSTEM_PROMPT = SYSTEM_INSTRUCTIONS + DEVELOPMENT_METHOD_REQUIREMENTS
+
+# Leading marker of the soft-failure fallback text; such results must never be cached
+OPTIMIZATION_FAILED_PREFIX = "/* Optimization Failed"
+
+class OptimizationStreamError(Exception):
+    """Raised when the optimizer stream breaks after part of the prompt was already yielded."""
+    pass
+
+COMBINED_OUTPUT_INSTRUCTIONS = """
+OUTPUT FORMAT:
+The mechanical prompt leaves the persona and complexity for you to decide.
+Respond ONLY with a JSON object of the form:
+{"persona": "<persona name and short description>", "complexity": "<Low|Medium|High and one-sentence reason>", "optimized_prompt": "<the full rewritten prompt>"}
+"""
+
+class PromptOptimizer:
+    def __init__(self, llm_client: LLMClient):
+        self.llm_client = llm_client
+
+    def _build_user_content(self, raw_prompt: str, mode: str, intention: str) -> str:
+        # Per-call fields only; all static guidance lives in OPTIMIZER_SYSTEM_PROMPT
+        return f"""The current mode is: {mode}.
 I have a mechanically generated prompt for the task: "{intention}".
-The current mode is: {mode}.
 
 MECHANICAL PROMPT:
 ---
 {raw_prompt}
 ---
 
-Please rewrite this prompt to be significantly longer, more creative, and more detailed. 
-Incorporate the specific development method requirements:
-1) write unit tests for the program.
-2) write necessary comments.
-3) For every module built, do a pilot run, get report/feedback, and refine.
-
-Make the prompt feel like a high-level research directive from a lead scientist.
+Please rewrite this prompt to be significantly longer, more creative, and more detailed, following the development method requirements.
 """
 
+    async def optimize_prompt(
+        self, 
+        raw_prompt: str, 
+        mode: str, 
+        intention: str
+    ) -> str:
+        """
+        Uses an LLM to refine and expand the mechanically generated prompt into a 
+        high-quality, long-form prompt designed for deep reasoning.
+        """
         messages = [
-            {"role": "system", "content": system_instructions},
-            {"role": "user", "content": user_content}
+            {"role": "system", "content": OPTIMIZER_SYSTEM_PROMPT},
+            {"role": "user", "content": self._build_user_content(raw_prompt, mode, intention)}
         ]
 
         try:
-            import asyncio
             optimized_prompt = await asyncio.wait_for(
                 self.llm_client.agenerate_completion(messages, temperature=0.8),
                 timeout=60.0
@@ -69,4 +92,74 @@ Make the prompt feel like a high-level research directive from a lead scientist.
         except (asyncio.TimeoutError, Exception) as e:
             # Fallback to raw if LLM optimization fails or times out
             logger.warning(f"Optimization phase soft-failed or timed out: {e}")
-            return f"/* Optimization Failed or Timed Out: {e} */\n\n{raw_prompt}"
+            return f"{OPTIMIZATION_FAILED_PREFIX} or Timed Out: {e} */\n\n{raw_prompt}"
+
+    async def optimize_prompt_stream(
+        self, 
+        raw_prompt: str, 
+        mode: str, 
+        intention: str
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of optimize_prompt: yields the optimized prompt as it is generated.
+        Falls back like optimize_prompt when nothing usable arrives. A failure after
+        chunks were yielded raises OptimizationStreamError: the output so far is truncated.
+        """
+        messages = [
+            {"role": "system", "content": OPTIMIZER_SYSTEM_PROMPT},
+            {"role": "user", "content": self._build_user_content(raw_prompt, mode, intention)}
+        ]
+
+        produced = False
+        try:
+            async with asyncio.timeout(60.0):
+                async for chunk in self.llm_client.astream_completion(messages, temperature=0.8):
+                    if chunk:
+                        produced = True
+                        yield chunk
+        except (asyncio.TimeoutError, Exception) as e:
+            logger.warning(f"Optimization stream soft-failed or timed out: {e}")
+            if produced:
+                raise OptimizationStreamError(f"Stream interrupted after partial output: {e}") from e
+            yield f"{OPTIMIZATION_FAILED_PREFIX} or Timed Out: {e} */\n\n{raw_prompt}"
+            return
+
+        if not produced:
+            yield raw_prompt
+
+    async def combined_prompt_build(
+        self, 
+        raw_prompt: str, 
+        mode: str, 
+        intention: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Single round-trip variant of the build: the model chooses persona and complexity
+        itself and returns them with the optimized prompt as one JSON object.
+        Returns None when the response is unusable so the caller can fall back.
+        """
+        messages = [
+            {"role": "system", "content": OPTIMIZER_SYSTEM_PROMPT + COMBINED_OUTPUT_INSTRUCTIONS},
+            {"role": "user", "content": self._build_user_content(raw_prompt, mode, intention)}
+        ]
+
+        try:
+            response = await asyncio.wait_for(
+                self.llm_client.agenerate_completion(messages, temperature=0.8),
+                timeout=60.0
+            )
+        except (asyncio.TimeoutError, Exception) as e:
+            logger.warning(f"Combined build soft-failed or timed out: {e}")
+            return None
+
+        parsed = parse_json_safely(response, default_fallback=None)
+        if not isinstance(parsed, dict):
+            return None
+        optimized_prompt = parsed.get("optimized_prompt")
+        if not isinstance(optimized_prompt, str) or not optimized_prompt.strip():
+            return None
+        return {
+            "persona": str(parsed.get("persona") or ""),
+            "complexity": str(parsed.get("complexity") or ""),
+            "optimized_prompt": optimized_prompt
+        }
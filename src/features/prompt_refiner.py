@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 from src.llm_integration import LLMClient
 
 class PromptRefiner:
@@ -8,15 +8,7 @@ class PromptRefiner:
     def __init__(self, llm_client: LLMClient):
         self.llm_client = llm_client
 
-    async def refine_prompt(
-        self, 
-        current_prompt: str, 
-        instruction: str,
-        context_insights: str = ""
-    ) -> str:
-        """
-        Refines the current prompt based on a specific user instruction.
-        """
+    def _build_messages(self, current_prompt: str, instruction: str, context_insights: str) -> List[Dict[str, str]]:
         system_instruction = """You are an expert Prompt Engineer. 
 You are given a high-quality technical prompt and a specific refinement instruction from a researcher.
 Your goal is to modify the prompt to incorporate the instruction while maintaining the professional, high-density tone.
@@ -41,9 +33,32 @@ REFINEMENT INSTRUCTION: {instruction}
 Provide the updated prompt in full.
 """
         
-        messages = [
+        return [
             {"role": "system", "content": system_instruction},
             {"role": "user", "content": user_content}
         ]
 
+    async def refine_prompt(
+        self, 
+        current_prompt: str, 
+        instruction: str,
+        context_insights: str = ""
+    ) -> str:
+        """
+        Refines the current prompt based on a specific user instruction.
+        """
+        messages = self._build_messages(current_prompt, instruction, context_insights)
         return await self.llm_client.agenerate_completion(messages, temperature=0.5)
+
+    async def refine_prompt_stream(
+        self, 
+        current_prompt: str, 
+        instruction: str,
+        context_insights: str = ""
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of refine_prompt: yields the updated prompt as it is generated.
+        """
+        messages = self._build_messages(current_prompt, instruction, context_insights)
+        async for chunk in self.llm_client.astream_completion(messages, temperature=0.5):
+            yield chunk
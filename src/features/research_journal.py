@@ -1,8 +1,13 @@
 import json
 import os
+import atexit
+import time
 import uuid
+import queue
+import sqlite3
+import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
 
 class ResearchEntry(BaseModel):
@@ -15,41 +20,190 @@ class ResearchEntry(BaseModel):
     metrics: Dict[str, Any] = {}
     tags: List[str] = []
 
+_COLUMNS = "entry_id, ts, intention, mode, insights, final_prompt, tags_json, metrics_json"
+_INSERT_SQL = f"INSERT INTO entries ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_SELECT_SQL = f"SELECT {_COLUMNS} FROM entries ORDER BY id LIMIT ? OFFSET ?"
+
+def _to_row(e: ResearchEntry) -> Tuple:
+    return (
+        e.entry_id, e.timestamp, e.intention, e.mode, e.insights, e.final_prompt,
+        json.dumps(e.tags), json.dumps(e.metrics)
+    )
+
+def _from_row(row: Tuple) -> ResearchEntry:
+    entry_id, ts, intention, mode, insights, final_prompt, tags_json, metrics_json = row
+    return ResearchEntry(
+        entry_id=entry_id, timestamp=ts, intention=intention, mode=mode, insights=insights,
+        final_prompt=final_prompt, tags=json.loads(tags_json), metrics=json.loads(metrics_json)
+    )
+
 class ResearchJournal:
     """
     Manages the persistent history of research sessions to ensure reproducibility.
+    Entries are rows in a SQLite database (WAL mode), so appends and paged reads
+    do not rewrite or re-parse the whole history.
     """
-    def __init__(self, storage_path: str = "results/research_journal.json"):
+    FLUSH_INTERVAL = 0.5  # Seconds the background writer waits to batch further entries
+
+    def __init__(self, storage_path: str = "results/research_journal.db"):
         self.storage_path = storage_path
+        # Guards the connection and the pending list, so readers never see an entry twice
+        self._lock = threading.Lock()
+        # Entries accepted by enqueue() but not yet on disk, in queue order
+        self._queue: "queue.Queue[Optional[ResearchEntry]]" = queue.Queue()
+        self._pending: List[ResearchEntry] = []
+        self._writer: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
         self._ensure_storage()
 
     def _ensure_storage(self):
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-        if not os.path.exists(self.storage_path):
-            with open(self.storage_path, "w") as f:
-                json.dump([], f)
+        legacy = self._take_legacy_json()
+        # One shared connection (guarded by self._lock); autocommit, explicit transactions for batches
+        self._conn = sqlite3.connect(self.storage_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, entry_id TEXT NOT NULL, ts TEXT NOT NULL, "
+            "intention TEXT NOT NULL, mode TEXT NOT NULL, insights TEXT, final_prompt TEXT, "
+            "tags_json TEXT NOT NULL, metrics_json TEXT NOT NULL)"
+        )
+        if legacy:
+            self._insert(legacy)
+
+    def _take_legacy_json(self) -> List[ResearchEntry]:
+        """
+        Imports a journal written by the JSON-file format: either the storage path itself
+        or the old default next to it. The JSON file is kept as *.bak after import.
+        """
+        candidates = [self.storage_path, os.path.splitext(self.storage_path)[0] + ".json"]
+        for path in dict.fromkeys(candidates):
+            try:
+                with open(path, "rb") as f:
+                    if f.read(1) not in (b"[", b""):
+                        continue # Not JSON (e.g. already a SQLite database)
+                    f.seek(0)
+                    raw = f.read()
+                entries = [ResearchEntry(**e) for e in json.loads(raw or b"[]")]
+            except (OSError, ValueError):
+                continue
+            os.replace(path, f"{path}.bak")
+            return entries
+        return []
+
+    def _insert(self, entries: List[ResearchEntry]):
+        # Caller holds self._lock (or is the constructor)
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(_INSERT_SQL, [_to_row(e) for e in entries])
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
 
     def add_entry(self, entry: ResearchEntry):
         try:
-            with open(self.storage_path, "r") as f:
-                journal = json.load(f)
-            journal.append(entry.model_dump())
-            with open(self.storage_path, "w") as f:
-                json.dump(journal, f, indent=2)
+            with self._lock:
+                self._insert([entry])
         except Exception as e:
             print(f"Failed to write to journal: {e}")
 
-    def get_entries(self, tag: Optional[str] = None) -> List[ResearchEntry]:
+    def enqueue(self, entry: ResearchEntry):
+        """
+        Write-behind variant of add_entry: returns immediately and a background thread
+        persists the entry, batching whatever else arrives within FLUSH_INTERVAL.
+        """
+        with self._lock:
+            self._pending.append(entry)
+            self._queue.put(entry)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, name="journal-writer", daemon=True)
+                self._writer.start()
+                # The writer is a daemon thread: persist whatever is still queued at interpreter exit
+                atexit.register(self.close)
+
+    def flush(self):
+        """Blocks until every enqueued entry has been written."""
+        self._queue.join()
+
+    def _drain(self):
+        # A None item (put by close()) stops the writer once everything before it is written
+        stop = False
+        while not stop:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while True:
+                if item is None:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            with self._lock:
+                try:
+                    self._insert(batch)
+                except Exception as e:
+                    print(f"Failed to write to journal: {e}")
+                del self._pending[:len(batch)]
+            for _ in batch:
+                self._queue.task_done()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] + len(self._pending)
+
+    def revision(self) -> Tuple[int, int, int]:
+        """Changes whenever an entry is added or the journal is cleared (ids are never reused)."""
+        with self._lock:
+            count, last_id = self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM entries").fetchone()
+            return count, last_id, len(self._pending)
+
+    def get_entries(self, tag: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[ResearchEntry]:
+        """Entries oldest first; limit/offset page through them (after tag filtering)."""
         try:
-            with open(self.storage_path, "r") as f:
-                journal = json.load(f)
-            entries = [ResearchEntry(**e) for e in journal]
-            if tag:
-                return [e for e in entries if tag in e.tags]
-            return entries
+            if tag is not None:
+                entries = [e for e in self.get_entries() if tag in e.tags]
+                return entries[offset:None if limit is None else offset + limit]
+            with self._lock:
+                stored = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                rows = self._conn.execute(_SELECT_SQL, (-1 if limit is None else limit, offset)).fetchall()
+                pending = list(self._pending)
+            # Pending entries follow every stored one; take the part of them inside the page
+            start = max(0, offset - stored)
+            end = None if limit is None else max(0, offset + limit - stored)
+            return [_from_row(r) for r in rows] + pending[start:end]
         except Exception:
             return []
 
+    def clear(self):
+        """Removes every entry, including ones still waiting to be written."""
+        self.flush()
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        """Writes any queued entries, stops the background writer and closes the database."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            atexit.unregister(self.close)
+            self._queue.put(None)
+            writer.join()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def export_as_markdown(self) -> str:
         entries = self.get_entries()
         md = "# CS Research Journal\n\n"
@@ -60,4 +214,4 @@ class ResearchJournal:
             if e.insights:
                 md += f"### Architectural Insights\n{e.insights}\n\n"
             md += "---\n"
-        return md
\ No newline at end of file
+        return md
@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger("ResponseCache")
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".prompt_generator", "cache", "responses.db")
+DEFAULT_TTL = 7 * 86400  # One week
+
+def make_cache_key(*parts: str) -> str:
+    """Stable content hash over the ordered key parts."""
+    # JSON keeps part boundaries unambiguous: ("a|b", "c") and ("a", "b|c") must not collide
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Persistent, process-safe cache for expensive LLM responses (SQLite-backed).
+    Any storage error is logged and treated as a miss so caching never breaks a build.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._ensure_storage()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Returns the default cache, or None when PROMPT_CACHE_DISABLE=1."""
+        if os.environ.get("PROMPT_CACHE_DISABLE") == "1":
+            return None
+        try:
+            return cls()
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _ensure_storage(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] < time.time():
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                return row[0]
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: str):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, time.time() + self.ttl)
+                )
+        except Exception as e:
+            logger.warning(f"Cache write failed: {e}")
@@ -1,5 +1,6 @@
 import random
 import string
+import asyncio
 import time
 import json
 import os
@@ -89,6 +90,16 @@ This is a mocked valid response.
         
         return "MOCKED_LLM_RESPONSE: " + last_msg[:50]
 
+    async def agenerate_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[int] = None
+    ) -> str:
+        return self.generate_completion(messages, model, temperature, max_tokens)
+
 class RobustnessOracle:
     """
     Verifies the validity of the output.
@@ -127,9 +138,15 @@ class ExperimentRunner:
         """
         Runs a single trial. If adversarial_str is provided, it replaces the intention.
         """
+        return asyncio.run(self.run_trial_async(intention, noise_level, adversarial_str))
+
+    async def run_trial_async(self, intention: str, noise_level: float = 0.0, adversarial_str: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async variant of run_trial so independent trials can run concurrently.
+        """
         # Setup
         mock_client = MockLLMClient()
-        builder = PromptBuilder(mock_client)
+        builder = PromptBuilder(mock_client, use_cache=False)
         
         # Perturb
         if adversarial_str:
@@ -146,7 +163,7 @@ class ExperimentRunner:
         output = ""
         
         try:
-            output = builder.build_prompt(
+            output, _ = await builder.build_prompt(
                 intention=final_input,
                 answers=[],
                 questions=[],
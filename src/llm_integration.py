@@ -1,7 +1,7 @@
 import os
 import logging
 import asyncio
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, AsyncIterator
 from dotenv import load_dotenv
 import litellm
 from litellm import exceptions
@@ -50,6 +50,28 @@ class LLMServiceError(LLMIntegrationError):
     """Raised when the LLM service fails."""
     pass
 
+# Model families that only cache a prompt prefix when it carries an explicit breakpoint.
+# OpenAI/Gemini cache stable leading tokens automatically, so their messages are sent unchanged.
+_EXPLICIT_PROMPT_CACHE_MARKERS = ("claude", "anthropic")
+_MAX_CACHE_BREAKPOINTS = 4  # Anthropic's per-request limit
+
+def _with_prompt_cache(messages: List[Dict[str, Any]], model: str) -> List[Dict[str, Any]]:
+    """
+    Marks each leading static system message as an ephemeral cache breakpoint where the provider needs one.
+    Callers order those messages from most to least widely shared and put per-call data after them.
+    """
+    if not messages or not any(marker in model.lower() for marker in _EXPLICIT_PROMPT_CACHE_MARKERS):
+        return messages
+    marked = list(messages)
+    for i, message in enumerate(messages[:_MAX_CACHE_BREAKPOINTS]):
+        if message.get("role") != "system" or not isinstance(message.get("content"), str):
+            break
+        marked[i] = {
+            "role": "system",
+            "content": [{"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}}]
+        }
+    return marked
+
 class LLMClient:
     """
     High-performance, robust client for interacting with various LLM providers.
@@ -103,6 +125,7 @@ class LLMClient:
             LLMServiceError: For other API failures.
         """
         target_model = model or self.default_model
+        messages = _with_prompt_cache(messages, target_model)
         
         # Define inner function to apply retry logic dynamically based on instance config
         @self._get_retry_decorator()
@@ -141,6 +164,7 @@ class LLMClient:
         """
         target_model = model or self.default_model
         effective_timeout = timeout or self.timeout
+        messages = _with_prompt_cache(messages, target_model)
         
         @self._get_retry_decorator()
         async def _call_litellm_async():
@@ -172,6 +196,55 @@ class LLMClient:
             logger.error(f"LLM Call Error ({type(e).__name__}) for {target_model}: {e}")
             raise LLMServiceError(f"LLM service failure: {e}") from e
 
+    async def astream_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous streaming variant: yields content deltas as they arrive.
+        Only opening the stream is retried; a stream that fails mid-way raises.
+        """
+        target_model = model or self.default_model
+        effective_timeout = timeout or self.timeout
+        messages = _with_prompt_cache(messages, target_model)
+
+        @self._get_retry_decorator()
+        async def _open_stream():
+            return await asyncio.wait_for(
+                litellm.acompletion(
+                    model=target_model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=effective_timeout,
+                    stream=True
+                ),
+                timeout=effective_timeout + 5 # Safety buffer
+            )
+
+        try:
+            stream = await _open_stream()
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except asyncio.TimeoutError:
+            logger.error(f"Global timeout reached for model {target_model}")
+            raise LLMServiceError(f"LLM stream timed out after {effective_timeout}s")
+        except exceptions.ContextWindowExceededError as e:
+            logger.error(f"Context window exceeded for model {target_model}: {e}")
+            raise LLMContextLimitError(f"Context window exceeded: {e}") from e
+        except exceptions.RateLimitError as e:
+            logger.error(f"Rate limit exceeded for {target_model}. Retrying via tenacity...")
+            raise LLMRateLimitError(f"Rate limit exceeded: {e}") from e
+        except Exception as e:
+            logger.error(f"LLM Stream Error ({type(e).__name__}) for {target_model}: {e}")
+            raise LLMServiceError(f"LLM service failure: {e}") from e
+
     def list_available_models(self) -> List[str]:
         return [
             "gpt-5.2",
@@ -1,15 +1,22 @@
 import typer
 import asyncio
+from pathlib import Path
 from rich.console import Console
 from rich.prompt import Prompt
 from rich.panel import Panel
 from rich.markdown import Markdown
+from rich.live import Live
+from rich.text import Text
 from typing import Optional
 
-from src.llm_integration import LLMClient
-from src.systems_engine import SystemsEngine, EngineState
-from src.cloud_engine import CloudEngine, CloudState
-from src.features.test_intention import IntentionTester
+# Engine modules (and the LLM SDK behind them) are imported inside each command,
+# so a command only pays for the part of the import graph it actually uses.
+
+try:
+    import uvloop # Optional: faster C/libuv event loop
+    _LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    _LOOP_FACTORY = None
 
 app = typer.Typer()
 console = Console()
@@ -21,11 +28,14 @@ def test_intention(
     """
     Test a software development intention for clarity, quality, and potential issues.
     """
+    from src.features.test_intention import IntentionTester
+
     tester = IntentionTester()
     console.print(f"\n[bold yellow]Testing Intention:[/bold yellow] [dim]{intention[:100]}...[/dim]")
     
     with console.status("[bold green]Analyzing..."):
-        result = asyncio.run(tester.test_intention(intention))
+        with asyncio.Runner(loop_factory=_LOOP_FACTORY) as runner:
+            result = runner.run(tester.test_intention(intention))
     
     if result.state.name == "COMPLETED":
         color = "green" if result.score > 70 else ("yellow" if result.score > 40 else "red")
@@ -48,6 +58,10 @@ def test_intention(
 async def run_generator(model: str, intention: Optional[str], domain: str = "Systems"):
     console.print(Panel(f"Welcome to the [bold blue]AI {domain} Prompt Generator[/bold blue]!", title="Welcome"))
 
+    from src.llm_integration import LLMClient
+    from src.systems_engine import SystemsEngine, EngineState
+    from src.cloud_engine import CloudEngine, CloudState
+
     # 1. Setup
     try:
         client = LLMClient(default_model=model)
@@ -72,12 +86,19 @@ async def run_generator(model: str, intention: Optional[str], domain: str = "Sys
     # 4. Execute Pipeline
     console.print(f"\n[yellow]Running high-performance {domain.lower()} generation pipeline...[/yellow]")
     
-    with console.status("[bold green]Processing..."):
-        if domain.lower() == "cloud":
+    if domain.lower() == "cloud":
+        with console.status("[bold green]Processing..."):
              # Cloud engine can take cloud_provider, but we'll stick to basics for main CLI consistency
              context = await engine.run_pipeline(intention, model=model, mode=mode)
-        else:
-             context = await engine.run_pipeline(intention, model=model, mode=mode)
+    else:
+        # Render the prompt live as the optimizer streams it; the final panel is printed below
+        streamed = []
+        with Live(Text("Processing...", style="bold green"), console=console, transient=True) as live:
+            def on_chunk(chunk: str):
+                streamed.append(chunk)
+                live.update(Text("".join(streamed)))
+
+            context = await engine.run_pipeline(intention, model=model, mode=mode, on_chunk=on_chunk)
 
     # 5. Handle Results
     if context.state == state_enum.COMPLETED and context.final_prompt:
@@ -90,8 +111,7 @@ async def run_generator(model: str, intention: Optional[str], domain: str = "Sys
         save_path = Prompt.ask("[bold]Save to file? (leave empty to skip)[/bold]", default="")
         if save_path:
             try:
-                with open(save_path, "w") as f:
-                    f.write(context.final_prompt)
+                Path(save_path).write_text(context.final_prompt, encoding="utf-8")
                 console.print(f"[green]Saved to {save_path}[/green]")
             except Exception as e:
                 console.print(f"[red]Failed to save file: {e}[/red]")
@@ -112,7 +132,8 @@ def generate(
     """
     Interactive Prompt Generator powered by Systems or Cloud Engine.
     """
-    asyncio.run(run_generator(model, intention, domain))
+    with asyncio.Runner(loop_factory=_LOOP_FACTORY) as runner:
+        runner.run(run_generator(model, intention, domain))
 
 if __name__ == "__main__":
     app()
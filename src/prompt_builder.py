@@ -1,6 +1,8 @@
+import os
+import re
 import logging
 import asyncio
-from typing import List, Optional, Tuple
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 from src.llm_integration import LLMClient
 from src.features.persona import suggest_persona
 from src.features.complexity import estimate_complexity
@@ -11,83 +13,92 @@ from src.features.prompt_templates import (
     get_one_shot_template
 )
 
-from src.features.prompt_optimizer import PromptOptimizer
+from src.features.prompt_optimizer import PromptOptimizer, OptimizationStreamError, OPTIMIZATION_FAILED_PREFIX
+from src.features.response_cache import ResponseCache, make_cache_key
 from src.features.discovery_agent import DiscoveryAgent
 from src.features.context_manager import scan_directory
 
 logger = logging.getLogger(__name__)
 
+# Placeholders the combined single-call build asks the model to resolve itself
+_DEFERRED_PERSONA = "(Select the most suitable expert persona for this task)"
+_DEFERRED_COMPLEXITY = "(Assess as Low, Medium or High)"
+
+# Pruning patterns for raw project context (compiled once at import)
+_TREE_RE = re.compile(r'([│├└─]{2,}.*\n?)+')
+_FILE_BLOCK_RE = re.compile(r'--- FILE: [^\n]* ---.*?--- END FILE ---', re.DOTALL)
+
+async def _with_retry(coro_factory: Callable[[], Awaitable[Any]], timeout: float, attempts: int = 2) -> Any:
+    """
+    Awaits a fresh coroutine from coro_factory with a per-attempt timeout.
+    Only timeouts are retried; the last TimeoutError propagates to the caller.
+    """
+    for attempt in range(attempts):
+        try:
+            return await asyncio.wait_for(coro_factory(), timeout=timeout)
+        except asyncio.TimeoutError:
+            if attempt == attempts - 1:
+                raise
+            logger.warning(f"LLM call exceeded {timeout}s budget, retrying ({attempt + 1}/{attempts})")
+
 class PromptBuilder:
-    def __init__(self, llm_client: LLMClient):
+    LLM_SIMPLE_TIMEOUT = 15.0  # Seconds per persona/complexity attempt
+    LLM_SIMPLE_ATTEMPTS = 2
+    # Context-free one-shot prompts shorter than this skip the optimizer (0 disables the fast path)
+    SKIP_OPTIMIZER_MIN_LEN = int(os.environ.get("PROMPT_SKIP_OPTIMIZER_MIN_LEN", "0"))
+
+    def __init__(self, llm_client: LLMClient, use_cache: bool = True, single_call: Optional[bool] = None):
         self.llm_client = llm_client
         self.optimizer = PromptOptimizer(llm_client)
         self.discovery_agent = DiscoveryAgent(llm_client)
+        # Optimizer responses are persisted across runs (disable with PROMPT_CACHE_DISABLE=1)
+        self.response_cache = ResponseCache.from_env() if use_cache else None
+        # Opt-in: fold persona + complexity + optimization into one LLM round-trip
+        if single_call is None:
+            single_call = os.environ.get("PROMPT_SINGLE_CALL") == "1"
+        self.single_call = single_call
 
-    async def build_prompt(
-        self, 
-        intention: str, 
-        answers: List[str], 
-        questions: List[str],
-        mode: str = "one-shot",
-        project_context: Optional[str] = None,
-        experiment_context: Optional[str] = None,
-        root_path: Optional[str] = None,
-        auto_discover: bool = False
-    ) -> Tuple[str, List[str]]:
-        """
-        Builds the final prompt using specialized templates and LLM optimization.
-        Returns (final_prompt, discovered_file_paths).
-        """
-        
-        # High performance: parallelize persona suggestion and complexity estimation
+    async def suggest_persona_and_complexity(self, intention: str, answers: List[str]) -> Tuple[str, str]:
+        # High performance: parallelize persona suggestion and complexity estimation.
+        # Each call gets its own budget so one stalled provider can't cancel the other.
         try:
-            # Added 45s safety timeout for the parallel tasks
-            persona, complexity = await asyncio.wait_for(
-                asyncio.gather(
-                    suggest_persona(intention, self.llm_client),
-                    estimate_complexity(intention, answers, self.llm_client),
-                    return_exceptions=True
+            persona, complexity = await asyncio.gather(
+                _with_retry(
+                    lambda: suggest_persona(intention, self.llm_client),
+                    self.LLM_SIMPLE_TIMEOUT, self.LLM_SIMPLE_ATTEMPTS
                 ),
-                timeout=45.0
+                _with_retry(
+                    lambda: estimate_complexity(intention, answers, self.llm_client),
+                    self.LLM_SIMPLE_TIMEOUT, self.LLM_SIMPLE_ATTEMPTS
+                ),
+                return_exceptions=True
             )
             if isinstance(persona, Exception) or not persona: persona = "Expert Software Engineer"
             if isinstance(complexity, Exception) or not complexity: complexity = "Standard"
         except (asyncio.TimeoutError, Exception):
             persona = "Expert Software Engineer"
             complexity = "Standard"
-        
-        # Construct Context from Q&A
-        qa_pairs = []
-        for q, a in zip(questions, answers):
-            qa_pairs.append(f"Q: {q}\nA: {a}")
-        
-        qa_context = "\n".join(qa_pairs) if qa_pairs else "No additional clarifications provided."
+        return persona, complexity
 
-        discovered_paths = []
-        # Autonomous Discovery Phase
-        if auto_discover and root_path:
-            # The tree/context provided is for the prompt agent's knowledge
-            # We use it to generate high-density insights
-            knowledge_map = project_context or scan_directory(root_path)
-            insights = await self.discovery_agent.investigate_and_analyze(root_path, intention, knowledge_map)
-            
-            # We explicitly overwrite project_context to ONLY include synthesized insights.
-            # We do NOT include the raw project tree or file contents in the final prompt
-            # because the consumer coding agent will read the codebase itself.
-            project_context = f"### ARCHITECTURAL INSIGHTS & INTEGRATION GUIDELINES\n{insights}"
-            discovered_paths = ["Autonomous Analysis performed"]
-        elif project_context:
-            # If not auto-discovering but context was provided, we still prune 
-            # obvious project structure/raw files to keep the prompt clean.
-            import re
-            # Prune tree-like structures and raw file blocks
-            project_context = re.sub(r'([│├└─]{2,}.*\n?)+', '', project_context) # Prune tree
-            project_context = re.sub(r'--- FILE: .* ---[\s\S]*?--- END FILE ---', '', project_context) # Prune raw blocks
-            project_context = project_context.strip()
+    async def _discover(self, root_path: str, intention: str, project_context: Optional[str]) -> str:
+        # The tree/context provided is for the prompt agent's knowledge
+        # We use it to generate high-density insights
+        knowledge_map = project_context or await asyncio.to_thread(scan_directory, root_path)
+        return await self.discovery_agent.investigate_and_analyze(root_path, intention, knowledge_map)
 
-        # Generate Mechanical Base Prompt
+    @staticmethod
+    def _render_template(
+        mode: str,
+        persona: str,
+        complexity: str,
+        intention: str,
+        qa_context: str,
+        project_context: Optional[str],
+        experiment_context: Optional[str]
+    ) -> str:
+        """Generates the mechanical base prompt for the mode and available context."""
         if project_context and experiment_context:
-            raw_prompt = get_research_experiment_template(
+            return get_research_experiment_template(
                 persona=persona,
                 intention=intention,
                 qa_context=qa_context,
@@ -95,7 +106,7 @@ class PromptBuilder:
                 experiment_context=experiment_context
             )
         elif mode == "iterative":
-            raw_prompt = get_iterative_long_form_template(
+            return get_iterative_long_form_template(
                 persona=persona,
                 intention=intention,
                 qa_context=qa_context,
@@ -104,7 +115,7 @@ class PromptBuilder:
                 experiment_context=experiment_context
             )
         elif mode == "chain-of-thought":
-            raw_prompt = get_detailed_cot_template(
+            return get_detailed_cot_template(
                 persona=persona,
                 intention=intention,
                 qa_context=qa_context,
@@ -113,7 +124,7 @@ class PromptBuilder:
                 experiment_context=experiment_context
             )
         else:
-            raw_prompt = get_one_shot_template(
+            return get_one_shot_template(
                 persona=persona,
                 intention=intention,
                 qa_context=qa_context,
@@ -121,15 +132,143 @@ class PromptBuilder:
                 experiment_context=experiment_context
             )
 
-        # Use AI to optimize and expand the prompt
+    async def build_prompt(
+        self, 
+        intention: str, 
+        answers: List[str], 
+        questions: List[str],
+        mode: str = "one-shot",
+        project_context: Optional[str] = None,
+        experiment_context: Optional[str] = None,
+        root_path: Optional[str] = None,
+        auto_discover: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        persona: Optional[str] = None,
+        complexity: Optional[str] = None,
+        on_fallback: Optional[Callable[[], None]] = None
+    ) -> Tuple[str, List[str]]:
+        """
+        Builds the final prompt using specialized templates and LLM optimization.
+        When on_chunk is given, the optimized prompt is streamed to it as it is generated.
+        on_fallback is called when optimization failed and the unoptimized template is returned.
+        persona/complexity may be resolved by the caller (see suggest_persona_and_complexity).
+        Returns (final_prompt, discovered_file_paths).
+        """
+        
+        # Whitespace-only contexts carry nothing; treat them as absent so the lighter templates apply
+        project_context = (project_context or "").strip() or None
+        experiment_context = (experiment_context or "").strip() or None
+
+        # Start discovery (directory walk in a worker thread, then the agent's LLM calls)
+        # so it overlaps the persona/complexity calls below
+        discovery_task = None
+        if auto_discover and root_path:
+            discovery_task = asyncio.create_task(self._discover(root_path, intention, project_context))
+
         try:
-            # Add evaluation strategy requirement to the optimizer context
-            eval_requirement = "\n4) Include a formal EVALUATION & BENCHMARKING section with specific metrics (e.g., latency, throughput, energy efficiency, or formal proof goals)."
+            if persona is not None and complexity is not None:
+                pass # Already resolved by the caller
+            elif self.single_call:
+                # Deferred to the combined optimizer call
+                persona, complexity = _DEFERRED_PERSONA, _DEFERRED_COMPLEXITY
+            else:
+                persona, complexity = await self.suggest_persona_and_complexity(intention, answers)
+        except BaseException:
+            if discovery_task is not None:
+                discovery_task.cancel()
+            raise
+        
+        # Construct Context from Q&A
+        qa_context = "\n".join(
+            f"Q: {q}\nA: {a}" for q, a in zip(questions, answers)
+        ) or "No additional clarifications provided."
+
+        discovered_paths = []
+        # Autonomous Discovery Phase
+        if discovery_task is not None:
+            insights = await discovery_task
             
-            optimized_prompt = await self.optimizer.optimize_prompt(raw_prompt, mode, intention + eval_requirement)
+            # We explicitly overwrite project_context to ONLY include synthesized insights.
+            # We do NOT include the raw project tree or file contents in the final prompt
+            # because the consumer coding agent will read the codebase itself.
+            project_context = f"### ARCHITECTURAL INSIGHTS & INTEGRATION GUIDELINES\n{insights}"
+            discovered_paths = ["Autonomous Analysis performed"]
+        elif project_context:
+            # If not auto-discovering but context was provided, we still prune 
+            # obvious project structure/raw files to keep the prompt clean.
+            # Prune tree-like structures and raw file blocks
+            project_context = _TREE_RE.sub('', project_context) # Prune tree
+            project_context = _FILE_BLOCK_RE.sub('', project_context) # Prune raw blocks
+            project_context = project_context.strip() or None
+
+        raw_prompt = self._render_template(
+            mode, persona, complexity, intention, qa_context, project_context, experiment_context
+        )
+
+        # Fast path: small context-free one-shot prompts go out without the optimizer round-trip
+        if (
+            mode == "one-shot"
+            and not self.single_call
+            and not project_context
+            and not experiment_context
+            and len(raw_prompt) < self.SKIP_OPTIMIZER_MIN_LEN
+        ):
+            logger.debug(f"Optimizer skipped: one-shot raw prompt of {len(raw_prompt)} chars is below {self.SKIP_OPTIMIZER_MIN_LEN}")
+            return raw_prompt, discovered_paths
+
+        # Identical (model, mode, intention, raw prompt) inputs reuse the stored optimization
+        cache_key = None
+        if self.response_cache is not None:
+            model = str(getattr(self.llm_client, "default_model", ""))
+            cache_key = make_cache_key(model, mode, intention, raw_prompt)
+            cached_prompt = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached_prompt is not None:
+                return cached_prompt, discovered_paths
+
+        # Use AI to optimize and expand the prompt
+        try:
+            # The evaluation/benchmarking requirement is part of the optimizer's static system prefix
+            combined = None
+            deferred = persona == _DEFERRED_PERSONA
+            if deferred:
+                combined = await self.optimizer.combined_prompt_build(raw_prompt, mode, intention)
+            if combined:
+                # The model normally resolves the placeholders in place; its explicit picks cover any it left
+                optimized_prompt = combined["optimized_prompt"]
+                if combined["persona"]:
+                    optimized_prompt = optimized_prompt.replace(_DEFERRED_PERSONA, combined["persona"])
+                if combined["complexity"]:
+                    optimized_prompt = optimized_prompt.replace(_DEFERRED_COMPLEXITY, combined["complexity"])
+            elif deferred:
+                # The plain optimizer is never asked to resolve the placeholders: re-render with real values
+                persona, complexity = await self.suggest_persona_and_complexity(intention, answers)
+                raw_prompt = self._render_template(
+                    mode, persona, complexity, intention, qa_context, project_context, experiment_context
+                )
+                optimized_prompt = await self.optimizer.optimize_prompt(raw_prompt, mode, intention)
+            elif on_chunk is not None:
+                try:
+                    chunks = []
+                    async for chunk in self.optimizer.optimize_prompt_stream(raw_prompt, mode, intention):
+                        chunks.append(chunk)
+                        on_chunk(chunk)
+                    optimized_prompt = "".join(chunks)
+                except OptimizationStreamError as e:
+                    # The streamed text is truncated: redo the optimization in one piece
+                    logger.warning(f"{e}; retrying without streaming")
+                    optimized_prompt = await self.optimizer.optimize_prompt(raw_prompt, mode, intention)
+            else:
+                optimized_prompt = await self.optimizer.optimize_prompt(raw_prompt, mode, intention)
             if not optimized_prompt:
                 optimized_prompt = raw_prompt
         except Exception:
             optimized_prompt = raw_prompt
+
+        # Only genuine optimizations are cached; fallbacks should be retried next time
+        if optimized_prompt == raw_prompt or optimized_prompt.startswith(OPTIMIZATION_FAILED_PREFIX):
+            if on_fallback is not None:
+                on_fallback()
+        elif cache_key:
+            await asyncio.to_thread(self.response_cache.set, cache_key, optimized_prompt)
             
         return optimized_prompt, discovered_paths
@@ -1,24 +1,32 @@
 import argparse
+import asyncio
 import time
 import json
 import os
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.features.benchmark_runner import BenchmarkRunner
 from src.features.benchmark_variants import BENCHMARK_VARIANTS
 
+try:
+    import uvloop # Optional: faster C/libuv event loop
+    _LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    _LOOP_FACTORY = None
+
 class SyntheticIntentionGenerator:
-    def __init__(self, runner: BenchmarkRunner):
+    def __init__(self, runner: BenchmarkRunner, seed: Optional[int] = None):
         self.runner = runner
         self.domains = ["Systems", "Security", "AI", "Cloud", "Embedded"]
+        self.rng = random.Random(seed)
+        # Use fast fallback intentions (rendered once) to avoid hanging during generation
+        self._templates = [
+            f"Implement a high-performance {domain} module with strict error handling."
+            for domain in self.domains
+        ]
 
     def generate(self, count: int = 1) -> List[str]:
-        intentions = []
-        for _ in range(count):
-            domain = random.choice(self.domains)
-            # Use a fast fallback intention to avoid hanging during generation
-            intentions.append(f"Implement a high-performance {domain} module with strict error handling.")
-        return intentions
+        return self.rng.choices(self._templates, k=count)
 
 class PromptTuner:
     def __init__(self, runner: BenchmarkRunner):
@@ -29,11 +37,12 @@ class PromptTuner:
         return None
 
 class BenchmarkOrchestrator:
-    def __init__(self, trials: int = 1, generations: int = 1, model: str = None, mock: bool = False):
+    def __init__(self, trials: int = 1, generations: int = 1, model: str = None, mock: bool = False, max_concurrency: int = 8, seed: Optional[int] = None):
         self.trials = trials
         self.generations = generations
+        self.max_concurrency = max_concurrency
         self.runner = BenchmarkRunner(model=model, mock=mock)
-        self.generator = SyntheticIntentionGenerator(self.runner)
+        self.generator = SyntheticIntentionGenerator(self.runner, seed=seed)
         self.variant_prompts = {k: None for k in BENCHMARK_VARIANTS.keys()}
         self.MAX_TOTAL_RUNTIME = 2400 # 40 minutes max for the entire script
 
@@ -44,36 +53,73 @@ class BenchmarkOrchestrator:
             
         print(f"[*] Starting Autonomous Benchmark (Max Runtime: {self.MAX_TOTAL_RUNTIME}s)")
         
-        for gen in range(self.generations):
-            if time.time() - start_time > self.MAX_TOTAL_RUNTIME:
-                print("[!] Global timeout reached. Terminating.")
-                break
-                
-            print(f"\n--- GENERATION {gen+1} ---", flush=True)
-            test_intentions = self.generator.generate(self.trials)
-            
-            for variant_id in variants:
-                if time.time() - start_time > self.MAX_TOTAL_RUNTIME: break
-                
-                print(f"[+] Variant: {variant_id}", flush=True)
-                for i, intention in enumerate(test_intentions):
-                    print(f"    Trial {i+1}...", end="", flush=True)
-                    res = self.runner.run_benchmark_trial(variant_id, intention)
-                    score = res['metrics']['stability_score']
-                    duration = res['metrics']['wall_time_ms']
-                    print(f" Score: {score} ({duration}ms)", flush=True)
+        # One persistent loop for every generation keeps the worker pool and connections warm
+        with asyncio.Runner(loop_factory=_LOOP_FACTORY) as loop_runner:
+            try:
+                for gen in range(self.generations):
+                    if time.time() - start_time > self.MAX_TOTAL_RUNTIME:
+                        print("[!] Global timeout reached. Terminating.")
+                        break
+                        
+                    print(f"\n--- GENERATION {gen+1} ---", flush=True)
+                    test_intentions = self.generator.generate(self.trials)
+                    
+                    remaining = self.MAX_TOTAL_RUNTIME - (time.time() - start_time)
+                    try:
+                        loop_runner.run(asyncio.wait_for(
+                            self._run_generation_async(variants, test_intentions),
+                            timeout=remaining
+                        ))
+                    except asyncio.TimeoutError:
+                        print("[!] Global timeout reached. Terminating.")
+                        break
+            finally:
+                # Stop in-flight trials first: leaving the Runner waits for their worker threads
+                self.runner.close()
 
         print(f"\n[*] Total Runtime: {time.time() - start_time:.2f}s")
 
+    async def _run_generation_async(self, variants: List[str], test_intentions: List[str]) -> List[Any]:
+        # Trials are independent and IO-bound: overlap them, bounded by the semaphore
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded_trial(variant_id: str, trial_idx: int, intention: str) -> Dict[str, Any]:
+            async with semaphore:
+                res = await self.runner.run_benchmark_trial_async(variant_id, intention)
+            score = res['metrics']['stability_score']
+            duration = res['metrics']['wall_time_ms']
+            print(f"[+] Variant: {variant_id} | Trial {trial_idx+1} Score: {score} ({duration}ms)", flush=True)
+            return res
+
+        trials = [
+            (variant_id, i, intention)
+            for variant_id in variants
+            for i, intention in enumerate(test_intentions)
+        ]
+        results = await asyncio.gather(*(_bounded_trial(*t) for t in trials), return_exceptions=True)
+
+        # Every trial gets to finish, then failures are reported and the first one is raised
+        errors = [(t, r) for t, r in zip(trials, results) if isinstance(r, BaseException)]
+        for (variant_id, trial_idx, _), error in errors:
+            print(f"[!] Variant: {variant_id} | Trial {trial_idx+1} failed: {type(error).__name__}: {error}", flush=True)
+        if errors:
+            raise errors[0][1]
+        return results
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--trials", type=int, default=1)
     parser.add_argument("--gens", type=int, default=1)
     parser.add_argument("--variants", nargs="+")
     parser.add_argument("--mock", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible intentions")
     args = parser.parse_args()
 
-    orchestrator = BenchmarkOrchestrator(trials=args.trials, generations=args.gens, mock=args.mock)
+    orchestrator = BenchmarkOrchestrator(
+        trials=args.trials, generations=args.gens, mock=args.mock,
+        max_concurrency=args.concurrency, seed=args.seed
+    )
     orchestrator.run_automated_loop(variants=args.variants)
 
 if __name__ == "__main__":
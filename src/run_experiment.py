@@ -1,17 +1,66 @@
 import argparse
+import asyncio
 import sys
 import os
+from collections import Counter
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.features.robustness import ExperimentRunner, PerturbationEngine
 
+try:
+    import uvloop # Optional: faster C/libuv event loop
+    _LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    _LOOP_FACTORY = None
+
+def classify_trial(res) -> str:
+    return "CRASHED" if res["crashed"] else ("INVALID" if not res["valid"] else "PASS")
+
+async def run_sweeps(args, runner: ExperimentRunner, engine: PerturbationEngine, baseline_intention: str):
+    # Trials are independent; overlap them, bounded by the semaphore
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded_trial(**kwargs):
+        async with semaphore:
+            return await runner.run_trial_async(baseline_intention, **kwargs)
+
+    # 1. Noise Sweep
+    print("\\n[+] Phase 1: Noise Injection Sweep")
+    noise_levels = [0.0, 0.1, 0.2, 0.3, 0.5]
+    
+    noise_results = await asyncio.gather(*[
+        bounded_trial(noise_level=noise)
+        for noise in noise_levels
+        for _ in range(args.trials)
+    ])
+    
+    for i, noise in enumerate(noise_levels):
+        print(f"    Testing Noise Level: {noise} ({args.trials} trials)")
+        # Single pass over the batch tallies every outcome at once
+        counts = Counter(map(classify_trial, noise_results[i * args.trials:(i + 1) * args.trials]))
+        print(f"    -> Crashes: {counts['CRASHED']}, Invalid Outputs: {counts['INVALID']}")
+
+    # 2. Adversarial Sweep
+    print("\\n[+] Phase 2: Adversarial Perturbation Sweep")
+    attacks = engine.get_adversarial_strings()
+    
+    attack_results = await asyncio.gather(*[bounded_trial(adversarial_str=attack) for attack in attacks])
+    
+    for attack, res in zip(attacks, attack_results):
+        print(f"    Testing Attack: {attack[:30]}...")
+        print(f"    -> Result: {classify_trial(res)} (Duration: {res['duration']:.4f}s)")
+
+    attack_counts = Counter(map(classify_trial, attack_results))
+    print(f"    -> Summary: {attack_counts['PASS']} passed, {attack_counts['INVALID']} invalid, {attack_counts['CRASHED']} crashed")
+
 def main():
     parser = argparse.ArgumentParser(description="Robustness Verification Experiment")
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
     parser.add_argument("--trials", type=int, default=5, help="Trials per noise level")
     parser.add_argument("--output", type=str, default="results/robustness.jsonl", help="Output log file")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum trials in flight")
     
     args = parser.parse_args()
     
@@ -22,31 +71,8 @@ def main():
     
     baseline_intention = "Create a distributed key-value store in Go using Raft consensus."
     
-    # 1. Noise Sweep
-    print("\\n[+] Phase 1: Noise Injection Sweep")
-    noise_levels = [0.0, 0.1, 0.2, 0.3, 0.5]
-    
-    for noise in noise_levels:
-        print(f"    Testing Noise Level: {noise} ({args.trials} trials)")
-        crashes = 0
-        invalids = 0
-        
-        for _ in range(args.trials):
-            res = runner.run_trial(baseline_intention, noise_level=noise)
-            if res["crashed"]: crashes += 1
-            if not res["crashed"] and not res["valid"]: invalids += 1
-            
-        print(f"    -> Crashes: {crashes}, Invalid Outputs: {invalids}")
-
-    # 2. Adversarial Sweep
-    print("\\n[+] Phase 2: Adversarial Perturbation Sweep")
-    attacks = engine.get_adversarial_strings()
-    
-    for attack in attacks:
-        print(f"    Testing Attack: {attack[:30]}...")
-        res = runner.run_trial(baseline_intention, adversarial_str=attack)
-        status = "CRASHED" if res["crashed"] else ("INVALID" if not res["valid"] else "PASS")
-        print(f"    -> Result: {status} (Duration: {res['duration']:.4f}s)")
+    with asyncio.Runner(loop_factory=_LOOP_FACTORY) as loop_runner:
+        loop_runner.run(run_sweeps(args, runner, engine, baseline_intention))
 
     print(f"\\n[*] Experiment Complete. Results saved to {args.output}")
 
@@ -1,13 +1,21 @@
 import asyncio
 import enum
+import hashlib
 import logging
 import time
 import sys
-import uuid
+import secrets
 import regex as re
+from collections import OrderedDict
 from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Set, Tuple, Union
-from pydantic import BaseModel, Field, field_validator, ConfigDict, ValidationError as PydanticValidationError
+from pydantic import BaseModel, Field, field_validator, computed_field, ConfigDict, ValidationError as PydanticValidationError
+
+try:
+    import re2 # Optional: linear-time multi-pattern DFA (google-re2)
+except ImportError:
+    re2 = None
 
 # Enhanced Logging Configuration
 logger = logging.getLogger("SecurityEngine")
@@ -32,11 +40,15 @@ class SecurityState(enum.Enum):
     FAILED = "FAILED"
     HALTED = "HALTED"
 
+    def __init__(self, value: str):
+        # Dense ordinal (0..N-1) used to index the transition bitmasks
+        self.index = len(type(self).__members__)
+
 # Strict Transition Map for the State Machine
 VALID_TRANSITIONS: Dict[SecurityState, Set[SecurityState]] = {
     SecurityState.IDLE: {SecurityState.INITIALIZING, SecurityState.FAILED},
     SecurityState.INITIALIZING: {SecurityState.PRE_PROCESSING, SecurityState.FAILED},
-    SecurityState.PRE_PROCESSING: {SecurityState.SCANNING, SecurityState.FAILED, SecurityState.HALTED},
+    SecurityState.PRE_PROCESSING: {SecurityState.SCANNING, SecurityState.COMPLETED, SecurityState.FAILED, SecurityState.HALTED},
     SecurityState.SCANNING: {SecurityState.SANITIZING, SecurityState.AUDITING, SecurityState.FAILED, SecurityState.HALTED},
     SecurityState.SANITIZING: {SecurityState.AUDITING, SecurityState.FAILED, SecurityState.HALTED},
     SecurityState.AUDITING: {SecurityState.COMPLETED, SecurityState.FAILED, SecurityState.HALTED},
@@ -45,6 +57,12 @@ VALID_TRANSITIONS: Dict[SecurityState, Set[SecurityState]] = {
     SecurityState.HALTED: {SecurityState.IDLE, SecurityState.INITIALIZING}
 }
 
+# VALID_TRANSITIONS as one bitmask per state, indexed by SecurityState.index (bit i set = target i allowed)
+_TRANSITION_MASKS = tuple(
+    sum(1 << target.index for target in VALID_TRANSITIONS.get(state, ()))
+    for state in SecurityState
+)
+
 class SecurityError(Exception):
     """Base exception for all SecurityEngine related errors."""
     def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
@@ -95,13 +113,17 @@ def get_now() -> datetime:
     except Exception:
         return datetime.min
 
+def new_request_id() -> str:
+    """Opaque 64-bit correlation id for logs; a full UUID4 costs ~4x more per request."""
+    return secrets.token_hex(8)
+
 class SecurityContext(BaseModel):
     """
     Pydantic-powered context for strict type safety and validation.
     """
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str = Field(default_factory=new_request_id)
     content: str
     sanitized_content: Optional[str] = None
     threat_level: str = "LOW"
@@ -111,8 +133,21 @@ class SecurityContext(BaseModel):
     error_trace: List[Dict[str, Any]] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    start_time: datetime = Field(default_factory=get_now)
-    end_time: Optional[datetime] = None
+    # Raw epoch nanoseconds on the hot path; datetimes are only built when read or serialized
+    start_time_ns: int = Field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+
+    @computed_field
+    @property
+    def start_time(self) -> datetime:
+        return datetime.fromtimestamp(self.start_time_ns / 1e9, tz=timezone.utc)
+
+    @computed_field
+    @property
+    def end_time(self) -> Optional[datetime]:
+        if self.end_time_ns is None:
+            return None
+        return datetime.fromtimestamp(self.end_time_ns / 1e9, tz=timezone.utc)
 
     @field_validator('content')
     @classmethod
@@ -132,6 +167,42 @@ class SecurityContext(BaseModel):
                 raise
             raise ValueError(f"Unexpected validation error: {e}")
 
+# Control characters, BOM and zero-width code points used to split keywords and evade scans
+_EVASION_TABLE = str.maketrans("", "", "".join(
+    [chr(c) for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)] + ["\ufeff", "\u200b", "\u200c", "\u200d"]
+))
+
+# EMAIL needs an '@' and every other PII pattern needs a digit; gates passes that cannot match
+_DIGIT_RE = re.compile(r"\d")
+
+# RE2's \s and \d are ASCII-only; spell out the Unicode classes 'regex' uses so evasions still match
+_RE2_ESCAPES = {
+    r"\s": r"[\t\n\x0b\f\r \x{85}\p{Z}]",
+    r"\d": r"\p{Nd}",
+}
+
+def _to_re2_syntax(pattern: str) -> str:
+    """Rewrites a 'regex' pattern for RE2, leaving escaped backslashes untouched."""
+    return re.sub(r"\\\\|\\[sd]", lambda m: _RE2_ESCAPES.get(m.group(0), m.group(0)), pattern)
+
+def _build_threat_set(patterns: List[str]):
+    """
+    Compiles patterns into one RE2 set, or returns None to use the 'regex' scans.
+    """
+    if re2 is None:
+        return None
+    try:
+        options = re2.Options()
+        options.case_sensitive = False
+        threat_set = re2.Set.SearchSet(options)
+        for pattern in patterns:
+            threat_set.Add(_to_re2_syntax(pattern))
+        threat_set.Compile()
+        return threat_set
+    except Exception as e:
+        logger.warning(f"RE2 threat set unavailable, falling back to 'regex' scans: {e}")
+        return None
+
 class SecurityEngine:
     """
     High-performance, industrial-grade Security module.
@@ -141,38 +212,65 @@ class SecurityEngine:
     2. VALIDATION: All inputs are validated before processing.
     3. BOUNDARIES: Enforces size limits, execution timeouts, and ReDoS protection.
     4. STATE MANAGEMENT: Uses a formal State Machine.
-    5. PERFORMANCE: Parallel scanning and optimized regex engine.
+    5. PERFORMANCE: Single-pass multi-pattern scanning and optimized regex engine.
     """
 
     MAX_CONTENT_SIZE = 250000  # 250KB
     GLOBAL_TIMEOUT = 15.0      # Seconds for the entire pipeline
     SCAN_TIMEOUT = 2.0         # Seconds per regex scan (ReDoS protection)
     MAX_RECURSION_DEPTH = 3    # Safety depth for nested sanitization
+    OFFLOAD_MIN_SIZE = 65536   # Chars; smaller payloads finish faster than a worker-thread hop
     REDACTION_CHAR = "*"
+    AUDIT_CACHE_SIZE = 128     # Completed audits kept by audit_content (0 disables)
 
     # Regex patterns for common PII/Secrets/Threats
-    # Optimized patterns for the 'regex' library
+    # Optimized patterns for the 'regex' library: possessive/atomic where a separator or keyword
+    # can never be given back, so those paths cannot backtrack
     PATTERNS = {
         "EMAIL": r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b",
-        "PHONE": r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
+        "PHONE": r"\b(?:\+?\d{1,3}[-.\s]?+)?\(?\d{3}\)?[-.\s]?+\d{3}[-.\s]?+\d{4}\b",
         "SSN": r"\b\d{3}-\d{2}-\d{4}\b",
         "CREDIT_CARD": r"\b(?:\d[ -]*?){13,16}\b",
         "IPV4": r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
-        "API_KEY": r"(?:api[\s_-]?key|secret|token|password|auth|access_key)[\s:=]+(['\"]?)([a-zA-Z0-9_\-\.]{20,})\1",
+        "API_KEY": r"(?>api[\s_-]?key|secret|token|password|auth|access_key)[\s:=]++(['\"]?)([a-zA-Z0-9_\-\.]{20,}+)\1",
         "PROMPT_INJECTION": r"(?:ignore\s+(?:all\s+)?previous\s+instructions|system\s+override|disregard\s+(?:the\s+)?above|you\s+are\s+now|new\s+role|acting\s+as|forget\s+all\s+rules)",
         "SQL_INJECTION": r"(?:SELECT\s+.*\s+FROM|INSERT\s+INTO|DROP\s+TABLE|DELETE\s+FROM|UNION\s+SELECT|SLEEP\(\d+\)|BENCHMARK\(\d+)",
         "XSS": r"(?:<script.*?>|javascript:|onload=|onerror=|eval\(|setTimeout\(|setInterval\()",
         "PATH_TRAVERSAL": r"(?:\.\./|\.\.\\|\/etc\/passwd|\/etc\/shadow|C:\\Windows\\System32)"
     }
 
+    # Threat patterns and the level each raises, in severity order (PROMPT_INJECTION short-circuits the rest)
+    THREAT_SPECS = (
+        ("PROMPT_INJECTION", "CRITICAL"),
+        ("SQL_INJECTION", "HIGH"),
+        ("XSS", "HIGH"),
+        ("PATH_TRAVERSAL", "HIGH"),
+        ("API_KEY", "HIGH"),
+    )
+    THREAT_NAMES = tuple(name for name, _ in THREAT_SPECS)
+    PII_NAMES = ("EMAIL", "PHONE", "SSN", "CREDIT_CARD", "IPV4")
+    # Scanned together in a single RE2 pass when available; API_KEY needs a backreference, which RE2 lacks
+    DFA_THREAT_NAMES = ("PROMPT_INJECTION", "SQL_INJECTION", "XSS", "PATH_TRAVERSAL")
+    # Literals each threat pattern cannot match without (compared against casefolded ASCII content)
+    THREAT_TRIGGERS = {
+        "PROMPT_INJECTION": ("ignore", "system", "disregard", "you", "new", "acting", "forget"),
+        "SQL_INJECTION": ("select", "insert", "drop", "delete", "union", "sleep(", "benchmark("),
+        "XSS": ("<script", "javascript:", "onload=", "onerror=", "eval(", "settimeout(", "setinterval("),
+        "PATH_TRAVERSAL": ("../", "..\\", "/etc/passwd", "/etc/shadow", "c:\\windows\\system32"),
+        "API_KEY": ("api", "secret", "token", "password", "auth", "access_key"),
+    }
+
     def __init__(self):
         """
         Initializes the engine with explicit error handling and pre-compiled patterns.
         """
         try:
             self._lock = asyncio.Lock()
-            # Pre-compile regex for performance with the 'regex' library
-            self._compiled_patterns = {k: re.compile(v, re.IGNORECASE) for k, v in self.PATTERNS.items()}
+            # Shared module-level compilations; nothing is recompiled per engine
+            self._compiled_patterns = _COMPILED_PATTERNS
+            self._threat_set = _THREAT_SET
+            # Completed audits by content digest, least recently used first
+            self._audit_cache: "OrderedDict[bytes, SecurityContext]" = OrderedDict()
             logger.info("SecurityEngine initialized with advanced regex patterns.")
         except Exception as e:
             logger.critical(f"Security Engine Bootstrap Failed: {e}")
@@ -186,7 +284,7 @@ class SecurityEngine:
             if not isinstance(target_state, SecurityState):
                  raise SecurityStateError(f"Invalid target state type: {type(target_state)}")
 
-            if target_state not in VALID_TRANSITIONS.get(context.state, set()):
+            if not (_TRANSITION_MASKS[context.state.index] >> target_state.index) & 1:
                 error_msg = f"Illegal transition attempted: {context.state} -> {target_state}"
                 logger.error(f"[{context.request_id}] {error_msg}")
                 raise SecurityStateError(error_msg, {"current_state": context.state, "target_state": target_state})
@@ -220,7 +318,7 @@ class SecurityEngine:
                 dummy_ctx = SecurityContext.model_construct(
                     content=str(content)[:100] if content else "EMPTY", 
                     state=SecurityState.FAILED,
-                    request_id=str(uuid.uuid4())
+                    request_id=new_request_id()
                 )
                 self._handle_failure(dummy_ctx, SecurityValidationError(f"Data model validation failed: {str(e)}"))
                 return dummy_ctx
@@ -229,8 +327,13 @@ class SecurityEngine:
             if depth > self.MAX_RECURSION_DEPTH:
                 raise ResourceLimitError(f"Maximum recursion depth {self.MAX_RECURSION_DEPTH} exceeded.")
 
-            # Run the entire pipeline within a global timeout
-            await asyncio.wait_for(self._run_pipeline(context), timeout=self.GLOBAL_TIMEOUT)
+            if len(content) >= self.OFFLOAD_MIN_SIZE:
+                # Large payloads: the CPU-bound pipeline runs on a worker thread ('regex' releases the GIL)
+                # so the loop stays responsive and the global timeout can actually fire
+                await asyncio.wait_for(asyncio.to_thread(self._run_pipeline, context), timeout=self.GLOBAL_TIMEOUT)
+            else:
+                # Small payloads finish in well under a millisecond; no coroutine or thread hop
+                self._run_pipeline(context)
             
         except asyncio.TimeoutError:
             if context:
@@ -250,12 +353,32 @@ class SecurityEngine:
         finally:
             if context:
                 context.metrics.total_duration_ms = (time.perf_counter() - t_start) * 1000
-                context.end_time = get_now()
+                context.end_time_ns = time.time_ns()
                 logger.info(f"[{context.request_id}] Security processing finished in {context.metrics.total_duration_ms:.2f}ms with state: {context.state.name}")
             
         return context
 
-    async def _run_pipeline(self, context: SecurityContext):
+    async def audit_content(self, content: str) -> Optional[SecurityContext]:
+        """
+        process_content for repeated audits of the same text (e.g. journal entries):
+        an identical earlier completed audit is returned instead of rescanning.
+        Failed runs are never cached, so timeouts and crashes are retried.
+        """
+        if not isinstance(content, str):
+            return await self.process_content(content)
+        key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        cached = self._audit_cache.get(key)
+        if cached is not None:
+            self._audit_cache.move_to_end(key)
+            return cached
+        context = await self.process_content(content)
+        if self.AUDIT_CACHE_SIZE > 0 and context and context.state == SecurityState.COMPLETED:
+            self._audit_cache[key] = context
+            if len(self._audit_cache) > self.AUDIT_CACHE_SIZE:
+                self._audit_cache.popitem(last=False)
+        return context
+
+    def _run_pipeline(self, context: SecurityContext):
         """
         Internal pipeline execution with granular state management.
         """
@@ -272,16 +395,23 @@ class SecurityEngine:
             self._pre_process(context)
             context.metrics.pre_processing_ms = (time.perf_counter() - pre_start) * 1000
 
+            # Benign fast path: none of the literals any threat or PII pattern needs are present,
+            # so scanning, sanitization and auditing could not change anything
+            if self._is_benign(context.content):
+                context.sanitized_content = context.content
+                self._update_state(context, SecurityState.COMPLETED)
+                return
+
             # 3. Scanning Phase
             self._update_state(context, SecurityState.SCANNING)
             scan_start = time.perf_counter()
-            await self._perform_scan(context)
+            self._perform_scan(context)
             context.metrics.scanning_ms = (time.perf_counter() - scan_start) * 1000
 
             # 4. Sanitization Phase
             self._update_state(context, SecurityState.SANITIZING)
             san_start = time.perf_counter()
-            await self._perform_sanitization(context)
+            self._perform_sanitization(context)
             context.metrics.sanitization_ms = (time.perf_counter() - san_start) * 1000
 
             # 5. Auditing Phase (Final Checks)
@@ -316,9 +446,9 @@ class SecurityEngine:
         Normalizes and prepares content for scanning.
         """
         try:
-            # Remove null bytes and other common control characters used in evasion
+            # Remove null bytes and other common control characters used in evasion (single pass)
             original_len = len(context.content)
-            normalized_content = context.content.replace('\x00', '')
+            normalized_content = context.content.translate(_EVASION_TABLE)
             
             if len(normalized_content) != original_len:
                 logger.warning(f"[{context.request_id}] Potential evasion characters removed during pre-processing.")
@@ -327,82 +457,103 @@ class SecurityEngine:
         except Exception as e:
             raise SecurityError(f"Pre-processing phase failure: {e}")
 
-    async def _perform_scan(self, context: SecurityContext):
+    def _perform_scan(self, context: SecurityContext):
         """
-        Scans for threats in parallel using pre-compiled regex with ReDoS protection.
+        Scans for threats using pre-compiled patterns with ReDoS protection.
         """
         try:
-            content = context.content
+            detected = self._detect_threats(context.content, context.request_id)
 
-            # Define scanning tasks for parallel execution
-            async def scan_task(name: str, pattern: re.Pattern):
-                try:
-                    # 'regex' library supports a timeout parameter to prevent ReDoS
-                    return name, bool(pattern.search(content, timeout=self.SCAN_TIMEOUT))
-                except TimeoutError:
-                    logger.error(f"[{context.request_id}] Scan for {name} timed out (potential ReDoS).")
-                    return name, False
-                except Exception as e:
-                    logger.error(f"[{context.request_id}] Scan for {name} failed: {e}")
-                    return name, False
-
-            # Execute scans in parallel for high performance
-            scan_jobs = [
-                scan_task("PROMPT_INJECTION", self._compiled_patterns["PROMPT_INJECTION"]),
-                scan_task("SQL_INJECTION", self._compiled_patterns["SQL_INJECTION"]),
-                scan_task("XSS", self._compiled_patterns["XSS"]),
-                scan_task("PATH_TRAVERSAL", self._compiled_patterns["PATH_TRAVERSAL"]),
-                scan_task("API_KEY", self._compiled_patterns["API_KEY"])
-            ]
-            
-            results = await asyncio.gather(*scan_jobs)
-            
-            for name, found in results:
-                if found:
-                    if name == "PROMPT_INJECTION":
-                        context.threat_level = "CRITICAL"
-                        context.metrics.threats_detected += 1
-                        raise ThreatDetectedError("Severe prompt injection attempt detected.")
-                    
-                    elif name in ["SQL_INJECTION", "XSS", "PATH_TRAVERSAL"]:
-                        context.threat_level = "HIGH"
-                        context.metrics.threats_detected += 1
-                        logger.warning(f"[{context.request_id}] {name} pattern detected.")
-                    
-                    elif name == "API_KEY":
-                        context.threat_level = "HIGH" if context.threat_level != "CRITICAL" else "CRITICAL"
-                        context.metrics.threats_detected += 1
-                        logger.warning(f"[{context.request_id}] Potential API key/secret detected.")
+            for name, level in self.THREAT_SPECS:
+                if name not in detected:
+                    continue
+                context.threat_level = level
+                context.metrics.threats_detected += 1
+                if level == "CRITICAL":
+                    raise ThreatDetectedError("Severe prompt injection attempt detected.")
+                logger.warning(f"[{context.request_id}] {name} pattern detected.")
 
         except ThreatDetectedError:
             raise
         except Exception as e:
             raise SecurityError(f"Scanning phase failure: {e}")
 
-    async def _perform_sanitization(self, context: SecurityContext):
+    def _is_benign(self, content: str) -> bool:
+        """
+        True when content holds no threat trigger literal, no '@' and no digit (see _DIGIT_RE).
+        Only ASCII content qualifies: casefolding expands characters such as U+0130 that the
+        IGNORECASE patterns still match, so the trigger literals would miss them.
+        """
+        if not content.isascii() or "@" in content or _DIGIT_RE.search(content, timeout=self.SCAN_TIMEOUT):
+            return False
+        folded = content.casefold()
+        return not any(
+            trigger in folded for triggers in self.THREAT_TRIGGERS.values() for trigger in triggers
+        )
+
+    def _detect_threats(self, content: str, request_id: str) -> Set[str]:
+        """
+        Returns the names of all threat patterns present in content.
+        RE2 covers DFA_THREAT_NAMES of ASCII content in one linear pass; the rest use 'regex' with ReDoS timeouts.
+        """
+        detected: Set[str] = set()
+        regex_names = self.THREAT_NAMES
+        # RE2's case folding is narrower than 'regex' IGNORECASE (U+0130 does not fold to 'i'),
+        # so non-ASCII content goes to the 'regex' patterns
+        if self._threat_set is not None and content.isascii():
+            try:
+                hits = self._threat_set.Match(content) or ()
+                detected.update(self.DFA_THREAT_NAMES[i] for i in hits)
+                regex_names = tuple(n for n in self.THREAT_NAMES if n not in self.DFA_THREAT_NAMES)
+            except Exception as e:
+                logger.error(f"[{request_id}] RE2 threat scan failed, using 'regex' scans: {e}")
+
+        # Cheap substring prefilter: a regex scan only runs if its pattern's literals are present.
+        # ASCII only: casefolding expands characters such as U+0130 that IGNORECASE still matches.
+        prefilter = content.isascii()
+        folded = content.casefold() if prefilter and regex_names else ""
+        for name in regex_names:
+            if prefilter and not any(trigger in folded for trigger in self.THREAT_TRIGGERS[name]):
+                continue
+            try:
+                # 'regex' library supports a timeout parameter to prevent ReDoS
+                if self._compiled_patterns[name].search(content, timeout=self.SCAN_TIMEOUT, concurrent=True):
+                    detected.add(name)
+            except TimeoutError:
+                logger.error(f"[{request_id}] Scan for {name} timed out (potential ReDoS).")
+            except Exception as e:
+                logger.error(f"[{request_id}] Scan for {name} failed: {e}")
+        return detected
+
+    def _perform_sanitization(self, context: SecurityContext):
         """
         Sanitizes PII and other sensitive data with high performance.
         """
         try:
             sanitized = context.content
             
-            # Efficiently redact multiple PII types
-            pii_types = ["EMAIL", "PHONE", "SSN", "CREDIT_CARD", "IPV4"]
-            for p_type in pii_types:
-                pattern = self._compiled_patterns[p_type]
-                matches = pattern.findall(sanitized, timeout=self.SCAN_TIMEOUT)
-                if matches:
+            # Efficiently redact multiple PII types, skipping passes whose required character is absent
+            has_email = "@" in sanitized
+            has_digit = _DIGIT_RE.search(sanitized, timeout=self.SCAN_TIMEOUT) is not None
+            for p_type in self.PII_NAMES:
+                if not (has_email if p_type == "EMAIL" else has_digit):
+                    continue
+                # One subn pass both collects the matches and redacts them
+                matches: List[str] = []
+                def redact_pii(match, found=matches, label=f"[{p_type}_REDACTED]"):
+                    found.append(match.group(0))
+                    return label
+
+                sanitized, count = self._compiled_patterns[p_type].subn(redact_pii, sanitized, timeout=self.SCAN_TIMEOUT)
+                if count:
                     context.pii_detected.extend(matches)
-                    sanitized = pattern.sub(f"[{p_type}_REDACTED]", sanitized, timeout=self.SCAN_TIMEOUT)
-                    context.metrics.pii_redacted_count += len(matches)
+                    context.metrics.pii_redacted_count += count
 
             # Redact API Keys / Secrets with a specialized callback for precision
             def redact_secret(match):
                 try:
-                    full_match = match.group(0)
-                    secret = match.group(2)
-                    prefix = full_match.split(secret)[0]
-                    return f"{prefix}[REDACTED_SECRET]"
+                    # Keep the "key = '" prefix by slicing spans instead of materialising and splitting groups
+                    return match.string[match.start():match.start(2)] + "[REDACTED_SECRET]"
                 except Exception:
                     return "[REDACTED_SECRET]"
             
@@ -422,8 +573,14 @@ class SecurityEngine:
             if context.sanitized_content is None:
                 raise SecurityError("Sanitized content is missing after sanitization phase.")
             
-            # Ensure no critical threats persisted after sanitization
-            if self._compiled_patterns["PROMPT_INJECTION"].search(context.sanitized_content, timeout=self.SCAN_TIMEOUT):
+            # Ensure no critical threats persisted after sanitization. The scan phase already rejected
+            # injections, so the full regex only runs if the injection trigger literals are present.
+            sanitized = context.sanitized_content
+            folded = sanitized.casefold()
+            if (
+                (not sanitized.isascii() or any(trigger in folded for trigger in self.THREAT_TRIGGERS["PROMPT_INJECTION"]))
+                and self._compiled_patterns["PROMPT_INJECTION"].search(sanitized, timeout=self.SCAN_TIMEOUT)
+            ):
                  raise ThreatDetectedError("Critical threat persisted after sanitization - system compromise risk.")
             
             # Boundary Check: Output Size
@@ -473,6 +630,10 @@ class SecurityEngine:
         except Exception as e:
             return {"status": "DEGRADED", "error": str(e)}
 
+# Compiled once per process and shared by every engine ('regex' patterns are immutable and thread-safe)
+_COMPILED_PATTERNS = MappingProxyType({k: re.compile(v, re.IGNORECASE) for k, v in SecurityEngine.PATTERNS.items()})
+_THREAT_SET = _build_threat_set([SecurityEngine.PATTERNS[n] for n in SecurityEngine.DFA_THREAT_NAMES])
+
 if __name__ == "__main__":
     async def main():
         engine = SecurityEngine()
@@ -1,26 +1,34 @@
 import asyncio
+import contextlib
 import enum
+import hashlib
 import logging
+import os
 import time
 import sys
-import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Union, Set, Tuple
-from pydantic import BaseModel, Field, field_validator, ConfigDict, ValidationError as PydanticValidationError
+from typing import List, Dict, Any, Optional, Union, FrozenSet, Tuple, Callable
+from pydantic import BaseModel, Field, field_validator, field_serializer, ConfigDict, ValidationError as PydanticValidationError
 
 from src.llm_integration import LLMClient, LLMIntegrationError
 from src.clarification_agent import ClarificationAgent
 from src.prompt_builder import PromptBuilder
-from src.security_engine import SecurityEngine, SecurityState, SecurityContext
-
-# Enhanced Logging Configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+from src.features.prompt_optimizer import OPTIMIZATION_FAILED_PREFIX
+from src.security_engine import SecurityEngine, SecurityState, SecurityContext, new_request_id
+
 logger = logging.getLogger("SystemsEngine")
 
+def _configure_logging():
+    """Installs the engine's console log format unless the host application already configured logging."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+            handlers=[logging.StreamHandler(sys.stdout)]
+        )
+
 class EngineState(enum.Enum):
     """
     Formalized states for the SystemsEngine lifecycle.
@@ -37,19 +45,33 @@ class EngineState(enum.Enum):
     HALTED = "HALTED"
 
 # Strict Transition Map for the State Machine
-VALID_TRANSITIONS: Dict[EngineState, Set[EngineState]] = {
-    EngineState.IDLE: {EngineState.INITIALIZING, EngineState.FAILED},
-    EngineState.INITIALIZING: {EngineState.SECURITY_SCAN, EngineState.FAILED},
-    EngineState.SECURITY_SCAN: {EngineState.VALIDATING, EngineState.FAILED, EngineState.HALTED},
-    EngineState.VALIDATING: {EngineState.CLARIFYING, EngineState.BUILDING, EngineState.FAILED},
-    EngineState.CLARIFYING: {EngineState.BUILDING, EngineState.FAILED, EngineState.HALTED},
-    EngineState.BUILDING: {EngineState.OPTIMIZING, EngineState.COMPLETED, EngineState.FAILED, EngineState.HALTED},
-    EngineState.OPTIMIZING: {EngineState.COMPLETED, EngineState.FAILED},
-    EngineState.COMPLETED: {EngineState.IDLE, EngineState.INITIALIZING},
-    EngineState.FAILED: {EngineState.IDLE, EngineState.INITIALIZING},
-    EngineState.HALTED: {EngineState.IDLE, EngineState.INITIALIZING}
+VALID_TRANSITIONS: Dict[EngineState, FrozenSet[EngineState]] = {
+    EngineState.IDLE: frozenset({EngineState.INITIALIZING, EngineState.FAILED}),
+    EngineState.INITIALIZING: frozenset({EngineState.SECURITY_SCAN, EngineState.FAILED}),
+    EngineState.SECURITY_SCAN: frozenset({EngineState.VALIDATING, EngineState.FAILED, EngineState.HALTED}),
+    EngineState.VALIDATING: frozenset({EngineState.CLARIFYING, EngineState.BUILDING, EngineState.COMPLETED, EngineState.FAILED}),
+    EngineState.CLARIFYING: frozenset({EngineState.BUILDING, EngineState.FAILED, EngineState.HALTED}),
+    EngineState.BUILDING: frozenset({EngineState.OPTIMIZING, EngineState.COMPLETED, EngineState.FAILED, EngineState.HALTED}),
+    EngineState.OPTIMIZING: frozenset({EngineState.COMPLETED, EngineState.FAILED}),
+    EngineState.COMPLETED: frozenset({EngineState.IDLE, EngineState.INITIALIZING}),
+    EngineState.FAILED: frozenset({EngineState.IDLE, EngineState.INITIALIZING}),
+    EngineState.HALTED: frozenset({EngineState.IDLE, EngineState.INITIALIZING})
 }
 
+_STATE_NAMES: Dict[EngineState, str] = {state: state.name for state in EngineState}
+
+_VALID_MODES: FrozenSet[str] = frozenset({"one-shot", "iterative", "chain-of-thought"})
+
+# Result cache key: (blake2b(intention), model, mode, answers)
+_ResultKey = Tuple[str, str, str, Tuple[str, ...]]
+
+def _lru_put(cache: OrderedDict, key: Any, value: Any, max_size: int):
+    """Inserts key as most recently used, evicting the oldest entries beyond max_size."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
 class EngineError(Exception):
     """Base exception for all SystemsEngine related errors."""
     def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
@@ -80,9 +102,11 @@ class ExecutionTimeoutError(EngineError):
     """Raised when a pipeline step exceeds its time budget."""
     pass
 
-class PerformanceMetrics(BaseModel):
+@dataclass(slots=True)
+class PerformanceMetrics:
     """
     Captures granular performance data for optimization analysis.
+    Engine-internal and written per phase, so a slotted dataclass rather than a validated model.
     """
     initialization_ms: float = 0.0
     validation_ms: float = 0.0
@@ -92,6 +116,10 @@ class PerformanceMetrics(BaseModel):
     total_duration_ms: float = 0.0
     llm_calls: int = 0
     estimated_tokens: int = 0
+    llm_in_flight: int = 0  # Peak engine-wide LLM calls in flight seen by this request
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 def get_now():
     """Thread-safe timestamp retrieval."""
@@ -100,13 +128,16 @@ def get_now():
     except Exception:
         return datetime.min # Fallback
 
+def _ns_to_iso(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
 class SystemContext(BaseModel):
     """
     Pydantic-powered context for strict type safety and validation.
     """
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str = Field(default_factory=new_request_id)
     intention: str
     model: str = "o3-mini"
     mode: str = "iterative"
@@ -121,6 +152,14 @@ class SystemContext(BaseModel):
     start_time: datetime = Field(default_factory=get_now)
     end_time: Optional[datetime] = None
 
+    @field_serializer('error_trace')
+    def serialize_error_trace(self, error_trace: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Entries record raw time_ns; the ISO timestamp is only formatted when the context is serialized
+        return [
+            {**entry, "timestamp": _ns_to_iso(entry["timestamp_ns"])} if "timestamp_ns" in entry else entry
+            for entry in error_trace
+        ]
+
     @field_validator('intention')
     @classmethod
     def validate_intention_non_empty(cls, v):
@@ -149,11 +188,15 @@ class SystemsEngine:
     """
 
     MAX_INTENTION_SIZE = 25000
+    MAX_PROMPT_SIZE = 100000  # Characters of generated prompt
     MAX_Q_COUNT = 15
     MAX_RECURSION_DEPTH = 5
     STEP_TIMEOUT = 90.0  # Seconds per major step
+    # Concurrent LLM-bound steps across all pipelines of this engine (2-8 keeps providers under rate limits)
+    LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONC", "8"))
+    RESULT_CACHE_SIZE = 256  # Completed pipeline results kept in memory (0 disables)
 
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+    def __init__(self, llm_client: Optional[LLMClient] = None, max_llm_concurrency: Optional[int] = None):
         """
         Initializes the engine with explicit error handling.
         """
@@ -162,32 +205,64 @@ class SystemsEngine:
             self.clarifier = ClarificationAgent(self.client)
             self.builder = PromptBuilder(self.client)
             self.security = SecurityEngine()
-            self._lock = asyncio.Lock()
+            self._llm_sem = asyncio.Semaphore(max_llm_concurrency or self.LLM_MAX_CONCURRENCY)
+            self._llm_in_flight = 0
+            # -> (final_prompt, questions, discovered_files)
+            self._result_cache: "OrderedDict[_ResultKey, Tuple[str, List[str], Any]]" = OrderedDict()
             logger.info("SystemsEngine initialized with core components including SecurityEngine.")
         except Exception as e:
             logger.critical(f"Engine Bootstrap Failed: {e}")
             raise EngineError("Failed to initialize SystemsEngine components.", {"original_error": str(e)})
 
+    @contextlib.asynccontextmanager
+    async def _llm_slot(self, context: SystemContext):
+        """
+        Holds one of the engine's LLM concurrency permits for the duration of the block.
+        """
+        async with self._llm_sem:
+            self._llm_in_flight += 1
+            context.metrics.llm_in_flight = max(context.metrics.llm_in_flight, self._llm_in_flight)
+            try:
+                yield
+            finally:
+                self._llm_in_flight -= 1
+
+    @staticmethod
+    def _result_key(context: SystemContext) -> "_ResultKey":
+        digest = hashlib.blake2b(context.intention.encode("utf-8"), digest_size=16).hexdigest()
+        return digest, context.model, context.mode, tuple(context.answers)
+
+    def _store_result(self, key: "_ResultKey", context: SystemContext):
+        """
+        Remembers a clean completed run; degraded runs (soft failures) are retried next time.
+        """
+        if self.RESULT_CACHE_SIZE <= 0 or context.error_trace:
+            return
+        if context.metadata.get("optimization_degraded") or (context.final_prompt or "").startswith(OPTIMIZATION_FAILED_PREFIX):
+            return
+        entry = (context.final_prompt, list(context.questions), context.metadata.get("discovered_files"))
+        _lru_put(self._result_cache, key, entry, self.RESULT_CACHE_SIZE)
+
+    async def _suggest_profile(self, context: SystemContext) -> Tuple[str, str]:
+        async with self._llm_slot(context):
+            return await self.builder.suggest_persona_and_complexity(context.intention, context.answers)
+
     def _update_state(self, context: SystemContext, target_state: EngineState):
         """
         Transitions the engine state with strict validation and error handling.
         """
-        try:
-            if not isinstance(target_state, EngineState):
-                 raise StateError(f"Invalid target state type: {type(target_state)}")
+        if __debug__ and not isinstance(target_state, EngineState):
+            raise StateError(f"Invalid target state type: {type(target_state)}")
 
-            if target_state not in VALID_TRANSITIONS.get(context.state, set()):
-                error_msg = f"Illegal transition attempted: {context.state} -> {target_state}"
-                logger.error(f"[{context.request_id}] {error_msg}")
-                raise StateError(error_msg, {"current_state": context.state, "target_state": target_state})
-            
-            logger.debug(f"[{context.request_id}] State Transition: {context.state.name} -> {target_state.name}")
-            context.state = target_state
-        except StateError:
-            raise
-        except Exception as e:
-            logger.error(f"State management internal failure: {e}")
-            raise StateError(f"Failed to update state: {e}")
+        # Every EngineState has an entry, so a KeyError here is a bug in the map itself
+        if target_state not in VALID_TRANSITIONS[context.state]:
+            error_msg = f"Illegal transition attempted: {context.state} -> {target_state}"
+            logger.error(f"[{context.request_id}] {error_msg}")
+            raise StateError(error_msg, {"current_state": context.state, "target_state": target_state})
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[{context.request_id}] State Transition: {_STATE_NAMES[context.state]} -> {_STATE_NAMES[target_state]}")
+        context.state = target_state
 
     async def run_pipeline(
         self, 
@@ -195,14 +270,19 @@ class SystemsEngine:
         model: str = "o3-mini", 
         mode: str = "iterative",
         answers: Optional[List[str]] = None,
-        depth: int = 0
+        depth: int = 0,
+        on_chunk: Optional[Callable[[str], None]] = None
     ) -> SystemContext:
         """
         Main execution entry point for the prompt generation pipeline.
         Implements top-level error handling and boundary checks.
+        on_chunk, if given, receives the final prompt incrementally while it is generated.
         """
         t_start = time.perf_counter()
+        # Phase boundaries as (metrics field or None, perf_counter); durations are derived once in finally
+        marks: List[Tuple[Optional[str], float]] = []
         context = None
+        profile_task = None
         
         try:
             # Boundary Check: Recursion
@@ -219,9 +299,10 @@ class SystemsEngine:
                 context = SystemContext(intention=intention, model=model, mode=mode, answers=answers or [])
             except PydanticValidationError as e:
                 # Create a minimal context for error reporting
+                # intention/model were type-checked above, so slicing needs no str() round-trip
                 dummy_ctx = SystemContext.model_construct(
-                    intention=str(intention)[:100], 
-                    model=str(model), 
+                    intention=intention[:100], 
+                    model=model, 
                     mode=str(mode), 
                     state=EngineState.FAILED
                 )
@@ -230,50 +311,69 @@ class SystemsEngine:
 
             # 1. Initialization Phase
             self._update_state(context, EngineState.INITIALIZING)
-            init_start = time.perf_counter()
+            marks.append(("initialization_ms", time.perf_counter()))
             self._validate_initial_config(context)
-            context.metrics.initialization_ms = (time.perf_counter() - init_start) * 1000
 
             # 2. Security Scan Phase
             self._update_state(context, EngineState.SECURITY_SCAN)
-            sec_start = time.perf_counter()
-            sec_context = await self.security.process_content(context.intention)
+            marks.append((None, time.perf_counter()))
+            # An identical earlier clean scan is reused (see SecurityEngine.audit_content)
+            sec_context = await self.security.audit_content(context.intention)
             if not sec_context or sec_context.state == SecurityState.FAILED:
                 reason = sec_context.error_trace[-1]["message"] if sec_context else "Security engine failure"
                 raise ValidationError(f"Security check failed: {reason}")
             
             # Update intention with sanitized version
             context.intention = sec_context.sanitized_content
-            context.metadata["security_metrics"] = sec_context.metrics.model_dump()
+            # Kept as the model (no per-request dump); SystemContext.model_dump serializes it on demand
+            context.metadata["security_metrics"] = sec_context.metrics
             
             # 3. Deep Validation Phase
             self._update_state(context, EngineState.VALIDATING)
-            val_start = time.perf_counter()
+            marks.append(("validation_ms", time.perf_counter()))
             self._perform_deep_validation(context)
-            context.metrics.validation_ms = (time.perf_counter() - val_start) * 1000
+
+            # Identical sanitized requests reuse the last completed result without any LLM round-trip
+            result_key = self._result_key(context)
+            cached = self._result_cache.get(result_key)
+            if cached is not None:
+                self._result_cache.move_to_end(result_key)
+                context.final_prompt, questions, context.metadata["discovered_files"] = cached
+                context.questions = list(questions)
+                context.metadata["result_cache_hit"] = True
+                if on_chunk is not None:
+                    on_chunk(context.final_prompt)
+                self._update_state(context, EngineState.COMPLETED)
+                context.end_time = get_now()
+                return context
 
             # 3. Clarification Phase
             self._update_state(context, EngineState.CLARIFYING)
+            marks.append((None if context.answers else "clarification_ms", time.perf_counter()))
             if not context.answers:
-                clar_start = time.perf_counter()
-                await asyncio.wait_for(self._run_clarification(context), timeout=self.STEP_TIMEOUT)
-                context.metrics.clarification_ms = (time.perf_counter() - clar_start) * 1000
+                # Persona/complexity only need the sanitized intention: overlap those LLM calls with the clarifier's
+                if not self.builder.single_call:
+                    profile_task = asyncio.create_task(self._suggest_profile(context))
+                async with asyncio.timeout(self.STEP_TIMEOUT):
+                    await self._run_clarification(context)
             else:
                 logger.info(f"[{context.request_id}] Skipping clarification: Pre-answered context provided.")
 
             # 4. Building Phase
             self._update_state(context, EngineState.BUILDING)
-            build_start = time.perf_counter()
-            await asyncio.wait_for(self._run_building(context), timeout=self.STEP_TIMEOUT)
-            context.metrics.building_ms = (time.perf_counter() - build_start) * 1000
+            marks.append(("building_ms", time.perf_counter()))
+            async with asyncio.timeout(self.STEP_TIMEOUT):
+                await self._run_building(context, on_chunk, profile_task)
 
             # 5. Optimization Phase
             self._update_state(context, EngineState.OPTIMIZING)
+            marks.append((None, time.perf_counter()))
             context.metrics.optimizing_ms = 0.1 # Placeholder for optimization logic
 
             # Finalize
             self._update_state(context, EngineState.COMPLETED)
             context.end_time = get_now()
+            self._store_result(result_key, context)
             
         except asyncio.TimeoutError:
             if context:
@@ -288,20 +388,36 @@ class SystemsEngine:
             if context:
                 self._handle_failure(context, EngineError(f"Internal system crash: {str(e)}"))
         finally:
+            if profile_task is not None and not profile_task.done():
+                profile_task.cancel()
             if context:
-                context.metrics.total_duration_ms = (time.perf_counter() - t_start) * 1000
-                logger.info(f"[{context.request_id}] Pipeline execution finished in {context.metrics.total_duration_ms:.2f}ms with state: {context.state.name}")
+                t_end = time.perf_counter()
+                marks.append((None, t_end))
+                for (field, t0), (_, t1) in zip(marks, marks[1:]):
+                    if field:
+                        setattr(context.metrics, field, (t1 - t0) * 1000)
+                context.metrics.total_duration_ms = (t_end - t_start) * 1000
+                logger.info(f"[{context.request_id}] Pipeline execution finished in {context.metrics.total_duration_ms:.2f}ms with state: {_STATE_NAMES[context.state]}")
             
         return context
 
+    async def run_pipeline_batch(self, intentions: List[str], **kwargs: Any) -> List[Union[SystemContext, BaseException]]:
+        """
+        Runs run_pipeline for every intention concurrently, in input order.
+        LLM-bound steps still share this engine's concurrency limit; kwargs apply to every run.
+        """
+        return await asyncio.gather(
+            *(self.run_pipeline(intention, **kwargs) for intention in intentions),
+            return_exceptions=True
+        )
+
     def _validate_initial_config(self, context: SystemContext):
         """
         Strict configuration checks with explicit error handling.
         """
         try:
-            valid_modes = {"one-shot", "iterative", "chain-of-thought"}
-            if context.mode not in valid_modes:
-                raise ValidationError(f"Invalid mode '{context.mode}'. Must be one of {valid_modes}")
+            if context.mode not in _VALID_MODES:
+                raise ValidationError(f"Invalid mode '{context.mode}'. Must be one of {sorted(_VALID_MODES)}")
             
             # Boundary Check: Input Size
             if len(context.intention) > self.MAX_INTENTION_SIZE:
@@ -321,9 +437,15 @@ class SystemsEngine:
             if not words:
                 raise ValidationError("Intention contains no words.")
                 
-            unique_words_ratio = len(set(words)) / len(words)
-            if unique_words_ratio < 0.1 and len(words) > 20:
-                 raise ValidationError("Intention appears to be non-instructional or highly repetitive (bot detection).")
+            # Unique-word ratio below 0.1 flags bot-like input; stop as soon as enough distinct words are seen
+            if len(words) > 20:
+                seen = set()
+                for word in words:
+                    seen.add(word)
+                    if len(seen) * 10 >= len(words):
+                        break
+                else:
+                    raise ValidationError("Intention appears to be non-instructional or highly repetitive (bot detection).")
             
             if len(words) > 10000:
                 raise BoundaryError("Intention contains too many tokens for reliable processing.")
@@ -337,7 +459,8 @@ class SystemsEngine:
         Executes clarification with soft-failure resilience and recursion safety.
         """
         try:
-            questions = await self.clarifier.generate_questions(context.intention)
+            async with self._llm_slot(context):
+                questions = await self.clarifier.generate_questions(context.intention)
             if not isinstance(questions, list):
                 raise ComponentError("Clarifier returned malformed output (expected list).")
             
@@ -350,27 +473,43 @@ class SystemsEngine:
                 "step": "clarification", 
                 "error": str(e), 
                 "severity": "WARNING",
-                "timestamp": get_now().isoformat()
+                "timestamp_ns": time.time_ns()
             })
             context.questions = []
 
-    async def _run_building(self, context: SystemContext):
+    async def _run_building(
+        self,
+        context: SystemContext,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        profile_task: Optional["asyncio.Task[Tuple[str, str]]"] = None
+    ):
         """
         Executes the building phase with strict component contract enforcement.
+        profile_task, if given, yields the (persona, complexity) resolved during clarification.
         """
+        def mark_degraded():
+            # The builder fell back to the unoptimized template: usable, but not worth keeping
+            context.metadata["optimization_degraded"] = True
+
         try:
-            result, disc_paths = await self.builder.build_prompt(
-                intention=context.intention,
-                answers=context.answers,
-                questions=context.questions,
-                mode=context.mode
-            )
+            persona, complexity = await profile_task if profile_task is not None else (None, None)
+            async with self._llm_slot(context):
+                result, disc_paths = await self.builder.build_prompt(
+                    intention=context.intention,
+                    answers=context.answers,
+                    questions=context.questions,
+                    mode=context.mode,
+                    on_chunk=on_chunk,
+                    persona=persona,
+                    complexity=complexity,
+                    on_fallback=mark_degraded
+                )
             
             if not result or not isinstance(result, str):
                 raise ComponentError("PromptBuilder produced empty or invalid string output.")
             
             # Boundary Check: Output Size
-            if len(result) > 100000:
+            if len(result) > self.MAX_PROMPT_SIZE:
                 raise BoundaryError("Generated prompt exceeds safety size limit (100KB).")
                 
             context.final_prompt = result
@@ -391,7 +530,7 @@ class SystemsEngine:
         try:
             context.state = EngineState.FAILED
             err_info = {
-                "timestamp": get_now().isoformat(),
+                "timestamp_ns": time.time_ns(),
                 "type": error.__class__.__name__,
                 "message": str(error),
                 "context": getattr(error, 'context', {})
@@ -418,6 +557,7 @@ class SystemsEngine:
                 },
                 "limits": {
                     "max_intention_size": self.MAX_INTENTION_SIZE,
+                    "max_prompt_size": self.MAX_PROMPT_SIZE,
                     "max_questions": self.MAX_Q_COUNT,
                     "max_recursion": self.MAX_RECURSION_DEPTH,
                     "step_timeout": self.STEP_TIMEOUT
@@ -427,6 +567,8 @@ class SystemsEngine:
             return {"status": "DEGRADED", "error": str(e)}
 
 if __name__ == "__main__":
+    _configure_logging()
+
     # Robust Smoke Test
     async def main():
         try:
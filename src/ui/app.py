@@ -4,6 +4,9 @@ import sys
 import json
 import asyncio
 import threading
+import queue
+import traceback
+import concurrent.futures
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
@@ -11,7 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")
 from src.llm_integration import LLMClient
 from src.clarification_agent import ClarificationAgent
 from src.prompt_builder import PromptBuilder
-from src.features.context_manager import scan_directory, read_key_files
+from src.features.context_manager import scan_directory, read_key_files, KEY_FILES
 from src.features.experiment_planner import generate_experiment_prompt_snippet
 from src.features.idea_generator import generate_idea_and_prompt, generate_idea_questions, generate_raw_idea
 from src.features.file_interface import read_project_file, get_file_metadata
@@ -19,75 +22,148 @@ from src.features.research_journal import ResearchJournal, ResearchEntry
 from src.features.academic_exporter import AcademicExporter
 from src.features.prompt_refiner import PromptRefiner
 from src.security_engine import SecurityEngine, SecurityState
-from src.features.pdf_parser import extract_text_from_pdf
 
-# Initialize Journal
-journal = ResearchJournal()
+ASYNC_TASK_TIMEOUT = 600.0  # Seconds before a background task is cancelled
+
+@st.cache_resource
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    One event loop per server process, running in a daemon thread and shared by every session and rerun.
+    Keeps LLM client connections warm instead of building and tearing down a loop per call.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="app-async-loop", daemon=True).start()
+    return loop
 
 def run_async(coro):
     """
-    Safely execute async functions in a dedicated thread.
+    Executes a coroutine on the shared background loop and blocks this script run until it completes.
     Enhanced with timeout and better error propagation.
     """
-    result = []
-    exception = []
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    try:
+        return future.result(timeout=ASYNC_TASK_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        error = TimeoutError("The operation took too long and was terminated.")
+    except Exception as e:
+        # Log the full traceback for cloud debugging
+        print(f"Error in background task: {e}")
+        traceback.print_exc()
+        error = e
+
+    # Reset stuck status if an error occurs
+    st.session_state.clarification_status = "IDLE"
+    st.session_state.idea_clarification_status = "IDLE"
+    # Provide a more user-friendly error in the UI
+    st.error(f"Background Task Error: {error}")
+    raise error
+
+async def _gather(coros):
+    return await asyncio.gather(*coros)
+
+def run_async_many(coros):
+    """Runs independent coroutines concurrently on the shared loop; results keep the input order."""
+    return run_async(_gather(coros))
+
+_STREAM_END = object()
+
+def iter_async(agen):
+    """
+    Drives an async generator on the shared loop and yields its items in this script thread,
+    so Streamlit elements (e.g. st.write_stream) can render them as they arrive.
+    """
+    chunks = queue.Queue()
 
-    def target():
+    async def pump():
         try:
-            # Set a new event loop for this thread to avoid Streamlit's event loop conflicts
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Add a global task timeout of 600s to prevent orphan threads
-                task = loop.create_task(coro)
-                res = loop.run_until_complete(asyncio.wait_for(task, timeout=600.0))
-                result.append(res)
-            finally:
-                # --- ROBUST CLEANUP ---
-                # 1. Gather all pending tasks (including those started by libraries like litellm)
-                pending = asyncio.all_tasks(loop)
-                if pending:
-                    # 2. Cancel them gracefully
-                    for p_task in pending:
-                        p_task.cancel()
-                    
-                    # 3. Allow tasks to finish cancellation (with a small timeout)
-                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                
-                # 4. Shutdown async generators (common in LLM streams)
-                loop.run_until_complete(loop.shutdown_asyncgens())
-                
-                # 5. Finally close the loop
-                loop.close()
-                asyncio.set_event_loop(None)
-                
-        except asyncio.TimeoutError:
-            exception.append(TimeoutError("The operation took too long and was terminated."))
-        except Exception as e:
-            import traceback
-            # Log the full traceback for cloud debugging
-            print(f"Error in run_async thread: {e}")
-            traceback.print_exc()
-            exception.append(e)
-
-    thread = threading.Thread(target=target, daemon=True)
-    thread.start()
-    thread.join()
-
-    if exception:
-        # Reset stuck status if an error occurs
-        st.session_state.clarification_status = "IDLE"
-        st.session_state.idea_clarification_status = "IDLE"
-        # Provide a more user-friendly error in the UI
-        st.error(f"Background Task Error: {exception[0]}")
-        raise exception[0]
-    
-    if not result:
-        st.error("Background task completed but returned no result.")
-        return None
-        
-    return result[0]
+            async for item in agen:
+                chunks.put(item)
+        finally:
+            chunks.put(_STREAM_END)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while (item := chunks.get(timeout=ASYNC_TASK_TIMEOUT)) is not _STREAM_END:
+            yield item
+        future.result()
+    except Exception as e:
+        print(f"Error in background stream: {e}")
+        traceback.print_exc()
+        st.error(f"Background Task Error: {e}")
+        raise
+    finally:
+        # Consumer stopped early or timed out: stop the producer too
+        if not future.done():
+            future.cancel()
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+def _file_signature(path: str) -> tuple:
+    # Size catches rewrites that land within the filesystem's mtime granularity
+    try:
+        stats = os.stat(path)
+        return stats.st_mtime_ns, stats.st_size
+    except OSError:
+        return 0, -1
+
+# Streamlit reruns this script on every widget interaction, so filesystem reads are memoized.
+# The mtime/signature arguments only feed the cache key: changing the path invalidates its entry.
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def _scan_directory_cached(root_path: str, mtime_ns: int) -> str:
+    return scan_directory(root_path)
+
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def _read_key_files_cached(root_path: str, signatures: tuple) -> dict:
+    return read_key_files(root_path)
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def _read_project_file_cached(root_path: str, relative_path: str, mtime_ns: int, size: int) -> str:
+    return read_project_file(root_path, relative_path)
+
+def cached_scan_directory(root_path: str) -> str:
+    # The root mtime only tracks top-level entries; nested changes show up once the TTL expires
+    return _scan_directory_cached(root_path, _mtime_ns(root_path))
+
+def cached_read_key_files(root_path: str) -> dict:
+    # Keyed on every key file's (mtime, size), so an edited README is re-read immediately
+    signatures = tuple(_file_signature(os.path.join(root_path, name)) for name in KEY_FILES)
+    return _read_key_files_cached(root_path, signatures)
+
+def cached_read_project_file(root_path: str, relative_path: str) -> str:
+    return _read_project_file_cached(root_path, relative_path, *_file_signature(os.path.join(root_path, relative_path)))
+
+@st.cache_resource
+def get_journal() -> ResearchJournal:
+    return ResearchJournal()
+
+JOURNAL_PAGE_SIZE = 20
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _journal_entries_cached(storage_path: str, revision: tuple, limit: int, offset: int) -> list:
+    return get_journal().get_entries(limit=limit, offset=offset)
+
+def get_journal_entries(limit: int, offset: int) -> list:
+    """One page of journal entries; re-read only when the journal changes."""
+    journal = get_journal()
+    return _journal_entries_cached(journal.storage_path, journal.revision(), limit, offset)
+
+# Initialize Journal
+journal = get_journal()
+
+@st.cache_resource
+def get_security_engine() -> SecurityEngine:
+    # Built on the first privacy audit rather than on every rerun
+    return SecurityEngine()
+
+# Journal entries are immutable once written, so their exports are keyed on entry_id alone
+@st.cache_data(max_entries=256, show_spinner=False)
+def latex_methodology_for_entry(entry_id: str, _insights: str, _intention: str) -> str:
+    return AcademicExporter.to_latex_methodology(_insights, _intention)
 
 # AI Page Config
 st.set_page_config(
@@ -120,9 +196,33 @@ if "idea_qa_history" not in st.session_state: st.session_state.idea_qa_history =
 if "idea_questions" not in st.session_state: st.session_state.idea_questions = []
 if "idea_clarification_status" not in st.session_state: st.session_state.idea_clarification_status = "IDLE"
 if "selected_files" not in st.session_state: st.session_state.selected_files = {}
+if "augmented_context" not in st.session_state: st.session_state.augmented_context = ""
 if "discovered_files" not in st.session_state: st.session_state.discovered_files = []
 if "paper_text" not in st.session_state: st.session_state.paper_text = ""
 
+_SELECTED_FILES_HEADER = "\n\n### SELECTED FILE CONTENTS (FOR AGENT KNOWLEDGE)\n"
+
+def _file_block(path: str, content: str) -> str:
+    return f"\n--- FILE: {path} ---\n{content}\n--- END FILE ---\n"
+
+def rebuild_augmented_context():
+    """Recomputes scanned project context + selected files; only needed when the scan or selection changes."""
+    augmented = st.session_state.project_context_str
+    if st.session_state.selected_files:
+        augmented += _SELECTED_FILES_HEADER + "".join(
+            _file_block(f, c) for f, c in st.session_state.selected_files.items()
+        )
+    st.session_state.augmented_context = augmented
+
+def add_selected_file(path: str, content: str):
+    # A new file lands last in the dict, so appending its block matches a rebuild; replacing a known file does not
+    extend = bool(st.session_state.selected_files) and path not in st.session_state.selected_files
+    st.session_state.selected_files[path] = content
+    if extend:
+        st.session_state.augmented_context += _file_block(path, content)
+    else:
+        rebuild_augmented_context()
+
 def reset_state():
     st.session_state.generated_prompt = ""
     st.session_state.second_prompt = ""
@@ -133,12 +233,24 @@ def reset_state():
     st.session_state.estimated_turns = 0
     st.session_state.discovered_files = []
 
+@st.cache_resource(ttl=600)
+def list_models() -> list:
+    try:
+        return LLMClient().list_available_models()
+    except Exception:
+        return ["gpt-5.2", "gemini-3", "claude-4.5", "o3-mini", "o1", "claude-3.5-sonnet", "gemini-2.0-flash"]
+
+@st.cache_resource
+def get_services(model: str):
+    """
+    Client and agents for one model, shared across reruns and sessions.
+    Building them opens the response cache, so they are not rebuilt per interaction.
+    """
+    client = LLMClient(default_model=model)
+    return client, ClarificationAgent(client), PromptBuilder(client), PromptRefiner(client)
+
 # Sidebar logic
-try:
-    temp_client = LLMClient()
-    available_models = temp_client.list_available_models()
-except Exception:
-    available_models = ["gpt-5.2", "gemini-3", "claude-4.5", "o3-mini", "o1", "claude-3.5-sonnet", "gemini-2.0-flash"]
+available_models = list_models()
 
 with st.sidebar:
     st.title("🤖 Configuration")
@@ -165,11 +277,7 @@ with st.sidebar:
 
 # Initialize Core Services
 try:
-    client = LLMClient(default_model=selected_model)
-    clarifier = ClarificationAgent(client)
-    builder = PromptBuilder(client)
-    refiner = PromptRefiner(client)
-    security = SecurityEngine()
+    client, clarifier, builder, refiner = get_services(selected_model)
 except Exception as e:
     st.error(f"Error initializing services: {e}")
     st.stop()
@@ -177,8 +285,7 @@ except Exception as e:
 # Tabs
 tab1, tab2, tab3, tab4 = st.tabs(["🆕 New Project", "🛠 Evolve Project", "📄 Paper to Code", "🔬 Research Hub"])
 
-def skip_question_callback(key):
-    st.session_state[key] = "[User skipped this question]"
+SKIPPED_ANSWER = "[User skipped this question]"
 
 # --- Tab 1: New Project ---
 with tab1:
@@ -214,21 +321,26 @@ with tab1:
         st.subheader("Clarification Questions")
         st.info(f"⏳ Estimated turns remaining: **{st.session_state.estimated_turns}**")
         
-        for i, q in enumerate(st.session_state.current_questions):
-            q_key = f"q_input_{i}_{len(st.session_state.qa_history)}"
-            col1, col2 = st.columns([5, 1])
-            with col1:
-                st.text_input(f"Q{i+1}: {q}", key=q_key)
-            with col2:
-                st.write(" ") # Padding
-                st.write(" ")
-                st.button("Skip", key=f"skip_{q_key}", on_click=skip_question_callback, args=(q_key,))
+        # Keys are scoped to the current round so a new round starts with empty inputs
+        turn = len(st.session_state.qa_history)
+        q_keys = [f"q_input_{i}_{turn}" for i in range(len(st.session_state.current_questions))]
+        # A form batches every answer into the single rerun triggered by its submit button
+        with st.form(f"clarify_form_{turn}"):
+            for i, (q, q_key) in enumerate(zip(st.session_state.current_questions, q_keys)):
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    st.text_input(f"Q{i+1}: {q}", key=q_key)
+                with col2:
+                    st.write(" ") # Padding
+                    st.write(" ")
+                    st.checkbox("Skip", key=f"skip_{q_key}")
+            submitted = st.form_submit_button("Evaluate All & Proceed", type="primary")
         
-        if st.button("Evaluate All & Proceed", type="primary"):
-            for i, q in enumerate(st.session_state.current_questions):
-                q_key = f"q_input_{i}_{len(st.session_state.qa_history)}"
-                ans = st.session_state.get(q_key, "")
-                st.session_state.qa_history.append({"q": q, "a": ans})
+        if submitted:
+            st.session_state.qa_history.extend(
+                {"q": q, "a": SKIPPED_ANSWER if st.session_state.get(f"skip_{q_key}") else st.session_state.get(q_key, "")}
+                for q, q_key in zip(st.session_state.current_questions, q_keys)
+            )
             
             with st.status("Re-evaluating technical clarity...", expanded=True):
                 result = run_async(clarifier.analyze_status(st.session_state.intention, st.session_state.qa_history))
@@ -257,24 +369,24 @@ with tab1:
                 questions = [item['q'] for item in st.session_state.qa_history]
                 answers = [item['a'] for item in st.session_state.qa_history]
                 
-                # Fetch insights for the journal
-                tree = scan_directory(os.getcwd())
-                st.write("Investigating context...")
-                insights = run_async(builder.discovery_agent.investigate_and_analyze(os.getcwd(), st.session_state.intention, tree))
-                
-                st.write("Generating primary prompt...")
-                final_prompt, disc_paths = run_async(builder.build_prompt(
-                    st.session_state.intention, answers, questions, mode=mode_mapping[mode_label]
-                ))
-                
-                second_p = ""
+                # Journal insights, the primary build and the optional consensus build are independent:
+                # run them concurrently on the shared loop
+                tree = cached_scan_directory(os.getcwd())
+                jobs = [
+                    builder.discovery_agent.investigate_and_analyze(os.getcwd(), st.session_state.intention, tree),
+                    builder.build_prompt(st.session_state.intention, answers, questions, mode=mode_mapping[mode_label])
+                ]
                 if consensus_mode and second_model:
-                    st.write(f"Generating consensus with {second_model}...")
-                    second_client = LLMClient(default_model=second_model)
-                    second_builder = PromptBuilder(second_client)
-                    second_p, _ = run_async(second_builder.build_prompt(
+                    st.write(f"Investigating context and generating prompts with {selected_model} and {second_model}...")
+                    second_builder = get_services(second_model)[2]
+                    jobs.append(second_builder.build_prompt(
                         st.session_state.intention, answers, questions, mode=mode_mapping[mode_label]
                     ))
+                else:
+                    st.write("Investigating context and generating primary prompt...")
+                results = run_async_many(jobs)
+                insights, (final_prompt, disc_paths) = results[0], results[1]
+                second_p = results[2][0] if len(results) > 2 else ""
 
                 st.session_state.generated_prompt = final_prompt
                 st.session_state.second_prompt = second_p
@@ -291,7 +403,8 @@ with tab1:
                 if second_p:
                     entry.tags.append(f"consensus:{second_model}")
                     entry.metrics["second_prompt"] = second_p
-                journal.add_entry(entry)
+                journal.enqueue(entry)
+                _journal_entries_cached.clear()
                 status.update(label="✨ Prompt Built!", state="complete")
 
         if st.session_state.generated_prompt:
@@ -312,7 +425,10 @@ with tab1:
             refine_input = st.chat_input("Suggest a change (e.g., 'Make it more modular')", key="chat_tab1")
             if refine_input:
                 with st.status("Refining prompt...", expanded=True):
-                    new_p = run_async(refiner.refine_prompt(st.session_state.generated_prompt, refine_input))
+                    # Render tokens as they arrive; the joined text replaces the prompt
+                    new_p = st.write_stream(iter_async(
+                        refiner.refine_prompt_stream(st.session_state.generated_prompt, refine_input)
+                    ))
                     st.session_state.generated_prompt = new_p
                 st.rerun()
 
@@ -328,10 +444,12 @@ with tab2:
         st.write(" ")
         if st.button("Scan Project"):
             with st.status("Scanning project structure...", expanded=True):
+                # An explicit scan always re-walks the tree: the cached one misses nested changes
                 st.session_state.project_context_str = scan_directory(project_path)
-                key_files = read_key_files(project_path)
+                key_files = cached_read_key_files(project_path)
                 for k, v in key_files.items():
                     st.session_state.project_context_str += f"\n\n--- {k} ---\n{v}"
+                rebuild_augmented_context()
             st.success("Scanned!")
 
     if st.session_state.project_context_str:
@@ -346,9 +464,9 @@ with tab2:
                 file_to_read = st.text_input("Enter relative path to read", placeholder="e.g., src/main.py")
                 if st.button("Read & Add"):
                     if file_to_read:
-                        content = read_project_file(project_path, file_to_read)
+                        content = cached_read_project_file(project_path, file_to_read)
                         if not content.startswith("Error:"):
-                            st.session_state.selected_files[file_to_read] = content
+                            add_selected_file(file_to_read, content)
                             st.success(f"Added {file_to_read}")
                         else:
                             st.error(content)
@@ -356,14 +474,11 @@ with tab2:
                     for f in list(st.session_state.selected_files.keys()):
                         if st.button(f"🗑 {f}", key=f"del_{f}"):
                             del st.session_state.selected_files[f]
+                            rebuild_augmented_context()
                             st.rerun()
 
-        # Augment context
-        augmented_context = st.session_state.project_context_str
-        if st.session_state.selected_files:
-            augmented_context += "\n\n### SELECTED FILE CONTENTS (FOR AGENT KNOWLEDGE)\n"
-            for f, c in st.session_state.selected_files.items():
-                augmented_context += f"\n--- FILE: {f} ---\n{c}\n--- END FILE ---\n"
+        # Augmented context is maintained incrementally in session state (see rebuild_augmented_context)
+        augmented_context = st.session_state.augmented_context
 
         st.divider()
         evolution_mode = st.segmented_control("Branch", ["🔬 Experimentation Lab", "🏭 Feature Factory"], default="🔬 Experimentation Lab")
@@ -438,28 +553,32 @@ with tab2:
         # Shared Clarification/Generation Logic
         if st.session_state.idea_clarification_status == "READY_AUTO":
             with st.status("🚀 Architecting Evolution...", expanded=True) as status:
-                st.write("Combining context...")
-                final_p, d_paths = run_async(generate_idea_and_prompt(
-                    client, builder, augmented_context, current_choice, 
-                    st.session_state.generated_idea, st.session_state.idea_qa_history,
-                    root_path=project_path, auto_discover=auto_discover
-                ))
-                st.write("Generating insights...")
-                ins = run_async(builder.discovery_agent.investigate_and_analyze(project_path, st.session_state.generated_idea, augmented_context))
+                st.write("Combining context and generating insights...")
+                (final_p, d_paths), ins = run_async_many([
+                    generate_idea_and_prompt(
+                        client, builder, augmented_context, current_choice, 
+                        st.session_state.generated_idea, st.session_state.idea_qa_history,
+                        root_path=project_path, auto_discover=auto_discover
+                    ),
+                    builder.discovery_agent.investigate_and_analyze(project_path, st.session_state.generated_idea, augmented_context)
+                ])
                 st.session_state.generated_prompt = final_p
                 st.session_state.discovered_files = d_paths
                 st.session_state.idea_clarification_status = "READY"
-                journal.add_entry(ResearchEntry(intention=st.session_state.generated_idea, mode=current_choice, insights=ins, final_prompt=final_p, tags=["evolution", current_choice, "auto"]))
+                journal.enqueue(ResearchEntry(intention=st.session_state.generated_idea, mode=current_choice, insights=ins, final_prompt=final_p, tags=["evolution", current_choice, "auto"]))
+                _journal_entries_cached.clear()
                 status.update(label="✅ Finalized!", state="complete")
             st.rerun()
 
         if st.session_state.idea_clarification_status == "REFINING":
             st.subheader("🗣 Technical Clarification")
-            for i, q in enumerate(st.session_state.idea_questions):
-                q_key = f"evolve_q_{i}"
-                st.text_input(q, key=q_key)
-            if st.button("🚀 Generate Final Implementation Prompt"):
-                st.session_state.idea_qa_history = [{"q": q, "a": st.session_state.get(f"evolve_q_{i}", "")} for i, q in enumerate(st.session_state.idea_questions)]
+            evolve_keys = [f"evolve_q_{i}" for i in range(len(st.session_state.idea_questions))]
+            with st.form("evolve_clarify_form"):
+                for q, q_key in zip(st.session_state.idea_questions, evolve_keys):
+                    st.text_input(q, key=q_key)
+                submitted = st.form_submit_button("🚀 Generate Final Implementation Prompt")
+            if submitted:
+                st.session_state.idea_qa_history = [{"q": q, "a": st.session_state.get(q_key, "")} for q, q_key in zip(st.session_state.idea_questions, evolve_keys)]
                 st.session_state.idea_clarification_status = "READY_AUTO"
                 st.rerun()
 
@@ -476,6 +595,8 @@ with tab3:
     uploaded_pdf = st.file_uploader("Upload PDF", type="pdf")
     if uploaded_pdf and st.button("Parse PDF"):
         with st.status("Parsing..."):
+            # pypdf is only needed here; importing it lazily keeps it off every cold start
+            from src.features.pdf_parser import extract_text_from_pdf
             st.session_state.paper_text = extract_text_from_pdf(uploaded_pdf)
     paper_input = st.text_area("Paper Content", value=st.session_state.paper_text, height=300)
     if st.button("Generate Plan"):
@@ -489,19 +610,27 @@ with tab3:
 # --- Tab 4: Research Hub ---
 with tab4:
     st.header("Research Journal")
-    entries = journal.get_entries()
+    # Newest first, one page of expanders at a time
+    total = journal.count()
+    pages = max(1, -(-total // JOURNAL_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    newest_end = total - (page - 1) * JOURNAL_PAGE_SIZE
+    offset = max(0, newest_end - JOURNAL_PAGE_SIZE)
+    entries = get_journal_entries(newest_end - offset, offset)
     for e in reversed(entries):
         with st.expander(f"📌 {e.timestamp} | {e.intention[:50]}..."):
             st.markdown(f"**Insights**: {e.insights}")
             st.code(e.final_prompt[:1000], language="markdown")
-            if st.button("🛡 Privacy Audit", key=f"sec_{e.entry_id}"):
-                with st.status("Auditing..."):
-                    res = run_async(security.process_content(e.final_prompt))
-                    if res.threat_level == "LOW": st.success("Pass")
-                    else: st.error(f"Threat: {res.threat_level}")
-            if st.button("📄 Export LaTeX", key=f"tex_{e.entry_id}"):
-                st.text_area("LaTeX", AcademicExporter.to_latex_methodology(e.insights or "", e.intention))
+            # Action widgets are only created for entries the user opens
+            if st.toggle("Open actions", key=f"act_{e.entry_id}"):
+                if st.button("🛡 Privacy Audit", key=f"sec_{e.entry_id}"):
+                    with st.status("Auditing..."):
+                        res = run_async(get_security_engine().audit_content(e.final_prompt))
+                        if res.threat_level == "LOW": st.success("Pass")
+                        else: st.error(f"Threat: {res.threat_level}")
+                if st.button("📄 Export LaTeX", key=f"tex_{e.entry_id}"):
+                    st.text_area("LaTeX", latex_methodology_for_entry(e.entry_id, e.insights or "", e.intention))
     if st.button("🗑 Clear Journal"):
-        if os.path.exists(journal.storage_path): os.remove(journal.storage_path)
-        journal._ensure_storage()
+        journal.clear()
+        _journal_entries_cached.clear()
         st.rerun()
@@ -0,0 +1,4 @@
+import os
+
+# Keep test runs isolated from the persistent on-disk response cache
+os.environ.setdefault("PROMPT_CACHE_DISABLE", "1")
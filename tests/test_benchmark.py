@@ -1,4 +1,6 @@
 import pytest
+import time
+import asyncio
 from unittest.mock import patch, MagicMock
 from src.features.benchmark_runner import BenchmarkRunner
 from src.features.benchmark_variants import BENCHMARK_VARIANTS
@@ -49,3 +51,40 @@ def test_tool_strict_format_check():
     
     assert runner._check_format_adherence("tool_strict", valid_json) is True
     assert runner._check_format_adherence("tool_strict", invalid_json) is False
+
+def test_generation_reports_trial_failures(tmp_path):
+    from src.run_benchmark import BenchmarkOrchestrator
+    orchestrator = BenchmarkOrchestrator(mock=True)
+    orchestrator.runner = BenchmarkRunner(output_file=str(tmp_path / "results.jsonl"), mock=True)
+
+    with pytest.raises(ValueError, match="Unknown variant"):
+        asyncio.run(orchestrator._run_generation_async(["does_not_exist"], ["Task"]))
+
+def test_closed_runner_stops_trials_and_logging(tmp_path):
+    output = tmp_path / "results.jsonl"
+    runner = BenchmarkRunner(output_file=str(output), mock=True)
+    runner.close()
+
+    # A trial still in flight after close neither waits out its delay nor reopens the log
+    start = time.monotonic()
+    runner.run_benchmark_trial("baseline", "Test intention")
+    assert time.monotonic() - start < 0.5
+    assert not output.exists()
+
+def test_global_timeout_stops_in_flight_trials(tmp_path):
+    from src.run_benchmark import BenchmarkOrchestrator
+    orchestrator = BenchmarkOrchestrator(mock=True)
+    runner = BenchmarkRunner(output_file=str(tmp_path / "results.jsonl"), mock=True)
+    orchestrator.runner = runner
+    orchestrator.MAX_TOTAL_RUNTIME = 0.5
+
+    def slow_trial(variant_id, intention, *args):
+        # Stands in for a CLI call that only returns early once the runner is closed
+        runner._stop.wait(10)
+        return {"metrics": {"stability_score": 0, "wall_time_ms": 0}}
+
+    runner.run_benchmark_trial = slow_trial
+    start = time.monotonic()
+    orchestrator.run_automated_loop(variants=["baseline"])
+
+    assert time.monotonic() - start < 2
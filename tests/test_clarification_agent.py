@@ -36,4 +36,20 @@ async def test_generate_questions_fallback(mock_llm_client):
     
     # Fallback provides a specific question
     assert len(questions) == 1
-    assert "architectural constraints" in questions[0]
\ No newline at end of file
+    assert "architectural constraints" in questions[0]
+
+@pytest.mark.asyncio
+async def test_analyze_status_reuses_cached_verdict(mock_llm_client, tmp_path):
+    from src.features.response_cache import ResponseCache
+    agent = ClarificationAgent(mock_llm_client)
+    agent.response_cache = ResponseCache(path=str(tmp_path / "responses.db"))
+    mock_llm_client.agenerate_completion.return_value = (
+        '{"status": "READY", "questions": [], "estimated_turns_remaining": 0, "rationale": "Clear."}'
+    )
+
+    first = await agent.analyze_status("Build a todo app in Go")
+    second = await agent.analyze_status("Build a todo  app in Go ")
+    await agent.analyze_status("Build a todo app in Go", [{"q": "DB?", "a": "SQLite"}])
+
+    assert first == second
+    assert mock_llm_client.agenerate_completion.await_count == 2
@@ -50,12 +50,14 @@ async def test_project_context_pruning():
 async def test_auto_discover_replaces_context():
     mock_client = MagicMock()
     mock_client.agenerate_completion = AsyncMock()
-    # 1. persona, 2. complexity, 3. discovery-selection, 4. discovery-analyst, 5. discovery-synthesis, 6. optimization
+    # 1. discovery-selection, 2. discovery-analyst, 3. discovery-synthesis, 4. optimization
     mock_client.agenerate_completion.side_effect = [
-        "Persona", "Complexity", '["f1.py"]', "Analyst Insight", "THESE ARE THE INSIGHTS", "Final Prompt"
+        '["f1.py"]', "Analyst Insight", "THESE ARE THE INSIGHTS", "Final Prompt"
     ]
     
     builder = PromptBuilder(mock_client)
+    # Persona/complexity run concurrently with discovery; keep them off the ordered mock
+    builder.suggest_persona_and_complexity = AsyncMock(return_value=("Persona", "Complexity"))
     
     dirty_context = "├── tree structure"
     
@@ -76,4 +78,58 @@ async def test_auto_discover_replaces_context():
     raw_prompt_in_user_content = args[0][1]["content"]
     
     assert "THESE ARE THE INSIGHTS" in raw_prompt_in_user_content
-    assert "├──" not in raw_prompt_in_user_content
\ No newline at end of file
+    assert "├──" not in raw_prompt_in_user_content
+
+@pytest.mark.asyncio
+async def test_blank_experiment_context_falls_back_to_mode_template():
+    mock_client = MagicMock()
+    mock_client.agenerate_completion = AsyncMock(side_effect=[
+        "Persona", "Complexity", "Final Clean Prompt"
+    ])
+    builder = PromptBuilder(mock_client)
+
+    # A whitespace-only experiment context must not select the research template
+    await builder.build_prompt(
+        intention="Test pruning",
+        answers=[],
+        questions=[],
+        mode="one-shot",
+        project_context="Important Research Note: This algorithm is linear.",
+        experiment_context="   \n"
+    )
+
+    args, kwargs = mock_client.agenerate_completion.call_args_list[-1]
+    prompt_sent_to_optimizer = args[0][1]["content"]
+
+    assert "RESEARCH RIGOR" not in prompt_sent_to_optimizer
+    assert "Important Research Note" in prompt_sent_to_optimizer
+
+@pytest.mark.asyncio
+async def test_discovery_overlaps_persona_resolution():
+    mock_client = MagicMock()
+    mock_client.agenerate_completion = AsyncMock(return_value="Final Prompt")
+    builder = PromptBuilder(mock_client, use_cache=False)
+    discovery_started = asyncio.Event()
+
+    async def discover(root_path, intention, project_context):
+        discovery_started.set()
+        return "INSIGHTS"
+
+    async def profile(intention, answers):
+        # Only completes if discovery is already running alongside it
+        await asyncio.wait_for(discovery_started.wait(), timeout=1)
+        return "Persona", "Complexity"
+
+    builder._discover = discover
+    builder.suggest_persona_and_complexity = profile
+
+    await builder.build_prompt(
+        intention="Test overlap",
+        answers=[],
+        questions=[],
+        auto_discover=True,
+        root_path="."
+    )
+
+    args, kwargs = mock_client.agenerate_completion.call_args_list[-1]
+    assert "INSIGHTS" in args[0][1]["content"]
@@ -20,4 +20,21 @@ async def test_discovery_logic():
     files = await agent.discover_and_read_context(".", intent, tree)
     
     assert "src/main.py" in files or "README.md" in files or len(files) == 0 # Mock doesn't actually read from disk unless files exist
-    assert mock_client.agenerate_completion.called
\ No newline at end of file
+    assert mock_client.agenerate_completion.called
+
+@pytest.mark.asyncio
+async def test_concurrent_investigations_are_coalesced():
+    mock_client = MagicMock()
+    # 1. selection, 2. analyst, 3. synthesis: one pipeline for both callers
+    mock_client.agenerate_completion = AsyncMock(side_effect=['["README.md"]', "Analyst Insight", "INSIGHTS"])
+
+    agent = DiscoveryAgent(mock_client)
+    tree = "Project Root\n└── README.md"
+    first, second = await asyncio.gather(
+        agent.investigate_and_analyze(".", "Document the API", tree),
+        agent.investigate_and_analyze(".", "Document the API", tree + "\n")
+    )
+
+    assert first == second == "INSIGHTS"
+    assert mock_client.agenerate_completion.call_count == 3
+    assert agent._inflight == {}
@@ -69,4 +69,15 @@ async def test_generate_idea_and_prompt_auto_discover(mock_client, mock_builder)
     assert disc == ["auto.py"]
     args, kwargs = mock_builder.build_prompt.call_args
     assert kwargs["root_path"] == "/tmp"
-    assert kwargs["auto_discover"] is True
\ No newline at end of file
+    assert kwargs["auto_discover"] is True
+
+@pytest.mark.asyncio
+async def test_idea_calls_share_project_context_prefix(mock_client):
+    mock_client.agenerate_completion.side_effect = ["Idea", '["Q1"]']
+    await generate_raw_idea(mock_client, "tree + files", "new features")
+    await generate_idea_questions(mock_client, "tree + files", "Idea", "new features")
+
+    first, second = (call.args[0] for call in mock_client.agenerate_completion.call_args_list)
+    assert first[0] == second[0]
+    assert first[0]["role"] == "system" and "tree + files" in first[0]["content"]
+    assert "Idea" in second[-1]["content"]
@@ -18,3 +18,17 @@ async def test_prompt_refiner():
     args, kwargs = mock_client.agenerate_completion.call_args
     assert "Old Prompt" in args[0][1]["content"]
     assert "Make it better" in args[0][1]["content"]
+
+@pytest.mark.asyncio
+async def test_prompt_refiner_stream():
+    async def fake_stream(messages, temperature=0.7):
+        assert "Make it better" in messages[1]["content"]
+        for chunk in ["Refined ", "Prompt"]:
+            yield chunk
+
+    mock_client = MagicMock()
+    mock_client.astream_completion = fake_stream
+    refiner = PromptRefiner(mock_client)
+
+    chunks = [c async for c in refiner.refine_prompt_stream("Old Prompt", "Make it better")]
+    assert "".join(chunks) == "Refined Prompt"
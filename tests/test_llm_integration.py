@@ -38,3 +38,19 @@ def test_generate_completion_error(llm_client, mocker):
         llm_client.generate_completion([{"role": "user", "content": "Hi"}])
     
     assert "API Error" in str(excinfo.value)
+
+def test_system_prefix_marked_cacheable_for_claude_only():
+    from unittest.mock import patch
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+    messages = [{"role": "system", "content": "STATIC"}, {"role": "user", "content": "dynamic"}]
+
+    with patch("litellm.completion", return_value=mock_response) as completion:
+        LLMClient().generate_completion(messages, model="claude-3-opus")
+        LLMClient().generate_completion(messages, model="gpt-4o")
+
+    claude_messages = completion.call_args_list[0].kwargs["messages"]
+    assert claude_messages[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert claude_messages[0]["content"][0]["text"] == "STATIC"
+    assert claude_messages[1] == messages[1]
+    assert completion.call_args_list[1].kwargs["messages"] == messages
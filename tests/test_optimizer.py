@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock
-from src.features.prompt_optimizer import PromptOptimizer
+from src.features.prompt_optimizer import PromptOptimizer, OptimizationStreamError
 
 @pytest.fixture
 def mock_llm_client():
@@ -30,4 +30,67 @@ async def test_optimize_prompt_fallback(mock_llm_client):
     result = await optimizer.optimize_prompt("raw_content", "one-shot", "intention")
     
     assert "Optimization Failed" in result
-    assert "raw_content" in result
\ No newline at end of file
+    assert "raw_content" in result
+
+@pytest.mark.asyncio
+async def test_combined_prompt_build_parses_json(mock_llm_client):
+    optimizer = PromptOptimizer(mock_llm_client)
+    mock_llm_client.agenerate_completion.return_value = (
+        '{"persona": "Kernel Engineer", "complexity": "High", "optimized_prompt": "# MISSION\\nDo it."}'
+    )
+
+    result = await optimizer.combined_prompt_build("raw", "one-shot", "intention")
+
+    assert result["persona"] == "Kernel Engineer"
+    assert result["optimized_prompt"].startswith("# MISSION")
+    args, _ = mock_llm_client.agenerate_completion.call_args
+    assert "JSON object" in args[0][0]["content"]
+
+@pytest.mark.asyncio
+async def test_combined_prompt_build_rejects_unusable_response(mock_llm_client):
+    optimizer = PromptOptimizer(mock_llm_client)
+    mock_llm_client.agenerate_completion.return_value = "Not JSON at all"
+
+    assert await optimizer.combined_prompt_build("raw", "one-shot", "intention") is None
+
+@pytest.mark.asyncio
+async def test_optimize_prompt_stream_yields_chunks(mock_llm_client):
+    async def fake_stream(messages, temperature=0.7):
+        for part in ["# MISSION", "\nStreamed"]:
+            yield part
+
+    mock_llm_client.astream_completion = fake_stream
+    optimizer = PromptOptimizer(mock_llm_client)
+
+    chunks = [c async for c in optimizer.optimize_prompt_stream("raw", "one-shot", "intention")]
+
+    assert chunks == ["# MISSION", "\nStreamed"]
+
+@pytest.mark.asyncio
+async def test_optimize_prompt_stream_fallback(mock_llm_client):
+    async def failing_stream(messages, temperature=0.7):
+        raise Exception("API Down")
+        yield  # pragma: no cover
+
+    mock_llm_client.astream_completion = failing_stream
+    optimizer = PromptOptimizer(mock_llm_client)
+
+    result = "".join([c async for c in optimizer.optimize_prompt_stream("raw_content", "one-shot", "intention")])
+
+    assert "Optimization Failed" in result
+    assert "raw_content" in result
+
+@pytest.mark.asyncio
+async def test_optimize_prompt_stream_raises_after_partial_output(mock_llm_client):
+    async def breaking_stream(messages, temperature=0.7):
+        yield "PARTIAL PROMPT"
+        raise Exception("Connection reset")
+
+    mock_llm_client.astream_completion = breaking_stream
+    optimizer = PromptOptimizer(mock_llm_client)
+
+    chunks = []
+    with pytest.raises(OptimizationStreamError):
+        async for c in optimizer.optimize_prompt_stream("raw", "one-shot", "intention"):
+            chunks.append(c)
+    assert chunks == ["PARTIAL PROMPT"]
@@ -1,4 +1,6 @@
 import pytest
+import asyncio
+import sqlite3
 from unittest.mock import MagicMock, patch, AsyncMock
 from src.prompt_builder import PromptBuilder
 
@@ -43,4 +45,154 @@ async def test_build_prompt_iterative(mock_optimize, mock_estimate_complexity, m
     prompt, disc = await builder.build_prompt("Task", [], [], mode="iterative")
     
     assert "CREATIVE ITERATIVE EVOLUTION" in prompt
-    assert "Atomic Cycle" in prompt
\ No newline at end of file
+    assert "Atomic Cycle" in prompt
+
+@pytest.mark.asyncio
+@patch("src.features.prompt_optimizer.PromptOptimizer.optimize_prompt", new_callable=AsyncMock)
+async def test_build_prompt_retries_stalled_persona(mock_optimize, mock_llm_client):
+    builder = PromptBuilder(mock_llm_client)
+    builder.LLM_SIMPLE_TIMEOUT = 0.05
+    mock_optimize.side_effect = lambda raw, mode, int: raw
+
+    calls = {"persona": 0}
+
+    async def stalling_persona(intention, client):
+        calls["persona"] += 1
+        if calls["persona"] == 1:
+            await asyncio.sleep(1)
+        return "Retried Persona"
+
+    with patch("src.prompt_builder.suggest_persona", side_effect=stalling_persona), \
+         patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="Low"):
+        prompt, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+
+    assert calls["persona"] == 2
+    assert "Retried Persona" in prompt
+
+
+@pytest.mark.asyncio
+@patch("src.prompt_builder.suggest_persona", new_callable=AsyncMock, return_value="Expert")
+@patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="Low")
+@patch("src.features.prompt_optimizer.PromptOptimizer.optimize_prompt", new_callable=AsyncMock)
+async def test_build_prompt_reuses_cached_optimization(mock_optimize, mock_estimate_complexity, mock_suggest_persona, mock_llm_client, tmp_path):
+    from src.features.response_cache import ResponseCache
+
+    builder = PromptBuilder(mock_llm_client)
+    builder.response_cache = ResponseCache(path=str(tmp_path / "responses.db"))
+    mock_optimize.return_value = "Optimized Prompt"
+
+    first, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+    second, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+
+    assert first == second == "Optimized Prompt"
+    assert mock_optimize.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_build_prompt_single_call_mode(mock_llm_client):
+    builder = PromptBuilder(mock_llm_client, single_call=True)
+    mock_llm_client.agenerate_completion.return_value = (
+        '{"persona": "Expert", "complexity": "Low", "optimized_prompt": "Combined Prompt"}'
+    )
+
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+
+    assert prompt == "Combined Prompt"
+    assert mock_llm_client.agenerate_completion.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("src.prompt_builder.suggest_persona", new_callable=AsyncMock, return_value="Kernel Engineer")
+@patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="High")
+@patch("src.features.prompt_optimizer.PromptOptimizer.optimize_prompt", new_callable=AsyncMock)
+@patch("src.features.prompt_optimizer.PromptOptimizer.combined_prompt_build", new_callable=AsyncMock, return_value=None)
+async def test_build_prompt_single_call_fallback_resolves_placeholders(mock_combined, mock_optimize, mock_estimate_complexity, mock_suggest_persona, mock_llm_client):
+    from src.prompt_builder import _DEFERRED_PERSONA, _DEFERRED_COMPLEXITY
+    builder = PromptBuilder(mock_llm_client, single_call=True)
+    mock_optimize.side_effect = lambda raw, mode, intention: raw
+
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="chain-of-thought")
+
+    mock_combined.assert_awaited_once()
+    mock_suggest_persona.assert_awaited_once()
+    assert "Kernel Engineer" in prompt
+    assert _DEFERRED_PERSONA not in prompt
+    assert _DEFERRED_COMPLEXITY not in prompt
+
+
+@pytest.mark.asyncio
+async def test_build_prompt_single_call_fills_placeholders_left_by_model(mock_llm_client):
+    from src.prompt_builder import _DEFERRED_PERSONA
+    builder = PromptBuilder(mock_llm_client, single_call=True)
+    mock_llm_client.agenerate_completion.return_value = (
+        '{"persona": "Expert", "complexity": "Low", "optimized_prompt": "You are ' + _DEFERRED_PERSONA + '."}'
+    )
+
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+
+    assert prompt == "You are Expert."
+
+
+@pytest.mark.asyncio
+@patch("src.prompt_builder.suggest_persona", new_callable=AsyncMock, return_value="Expert")
+@patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="Low")
+@patch("src.features.prompt_optimizer.PromptOptimizer.optimize_prompt", new_callable=AsyncMock)
+async def test_build_prompt_skips_optimizer_for_short_one_shot(mock_optimize, mock_estimate_complexity, mock_suggest_persona, mock_llm_client):
+    builder = PromptBuilder(mock_llm_client)
+    builder.SKIP_OPTIMIZER_MIN_LEN = 10000
+
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="one-shot")
+
+    assert "MISSION" in prompt
+    mock_optimize.assert_not_awaited()
+
+    # Other modes always go through the optimizer
+    mock_optimize.return_value = "Optimized"
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="chain-of-thought")
+    assert prompt == "Optimized"
+
+
+@pytest.mark.asyncio
+@patch("src.prompt_builder.suggest_persona", new_callable=AsyncMock, return_value="Expert")
+@patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="Low")
+async def test_build_prompt_does_not_cache_truncated_stream(mock_estimate_complexity, mock_suggest_persona, mock_llm_client, tmp_path):
+    from src.features.response_cache import ResponseCache
+
+    async def breaking_stream(messages, temperature=0.7):
+        yield "PARTIAL PROMPT"
+        raise Exception("Connection reset")
+
+    mock_llm_client.astream_completion = breaking_stream
+    mock_llm_client.agenerate_completion.side_effect = Exception("Still down")
+    builder = PromptBuilder(mock_llm_client)
+    builder.response_cache = ResponseCache(path=str(tmp_path / "responses.db"))
+
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="one-shot", on_chunk=lambda c: None)
+
+    # The non-streaming retry also failed: the soft-failure fallback is returned and nothing is cached
+    assert prompt.startswith("/* Optimization Failed")
+    assert "MISSION" in prompt
+    with sqlite3.connect(builder.response_cache.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+
+@pytest.mark.asyncio
+@patch("src.prompt_builder.suggest_persona", new_callable=AsyncMock, return_value="Expert")
+@patch("src.prompt_builder.estimate_complexity", new_callable=AsyncMock, return_value="Low")
+@patch("src.features.prompt_optimizer.PromptOptimizer.optimize_prompt", new_callable=AsyncMock)
+async def test_build_prompt_reports_fallback_to_raw_template(mock_optimize, mock_estimate_complexity, mock_suggest_persona, mock_llm_client):
+    builder = PromptBuilder(mock_llm_client)
+    fallbacks = []
+
+    # Optimizer crashed: the raw template is returned and reported
+    mock_optimize.side_effect = Exception("API Down")
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="iterative", on_fallback=lambda: fallbacks.append(1))
+    assert "MISSION" in prompt
+    assert len(fallbacks) == 1
+
+    # Genuine optimization: nothing reported
+    mock_optimize.side_effect = None
+    mock_optimize.return_value = "Optimized"
+    prompt, _ = await builder.build_prompt("Task", [], [], mode="iterative", on_fallback=lambda: fallbacks.append(1))
+    assert prompt == "Optimized"
+    assert len(fallbacks) == 1
@@ -1,15 +1,10 @@
 import pytest
-import os
 import json
 from src.features.research_journal import ResearchJournal, ResearchEntry
 from src.features.academic_exporter import AcademicExporter
 
-def test_research_journal_functionality():
-    temp_journal_path = "results/test_journal.json"
-    if os.path.exists(temp_journal_path):
-        os.remove(temp_journal_path)
-        
-    journal = ResearchJournal(storage_path=temp_journal_path)
+def test_research_journal_functionality(tmp_path):
+    journal = ResearchJournal(storage_path=str(tmp_path / "test_journal.db"))
     entry = ResearchEntry(
         intention="Test research intention",
         mode="iterative",
@@ -25,7 +20,47 @@ def test_research_journal_functionality():
     assert entries[0].intention == "Test research intention"
     assert "Detail 1" in journal.export_as_markdown()
     
-    os.remove(temp_journal_path)
+    journal.close()
+
+def test_enqueued_entries_are_batched_to_disk(tmp_path):
+    journal = ResearchJournal(storage_path=str(tmp_path / "journal.db"))
+    journal.FLUSH_INTERVAL = 0.05
+
+    for i in range(3):
+        journal.enqueue(ResearchEntry(intention=f"Queued {i}", mode="iterative"))
+    # Visible immediately, before the writer has caught up
+    assert [e.intention for e in journal.get_entries()] == ["Queued 0", "Queued 1", "Queued 2"]
+
+    journal.flush()
+    reopened = ResearchJournal(storage_path=journal.storage_path)
+    assert [e.intention for e in reopened.get_entries()] == ["Queued 0", "Queued 1", "Queued 2"]
+
+def test_close_persists_enqueued_entries_and_stops_writer(tmp_path):
+    journal = ResearchJournal(storage_path=str(tmp_path / "journal.db"))
+    journal.enqueue(ResearchEntry(intention="Queued at exit", mode="iterative"))
+    writer = journal._writer
+
+    journal.close()
+
+    assert not writer.is_alive()
+    reopened = ResearchJournal(storage_path=journal.storage_path)
+    assert [e.intention for e in reopened.get_entries()] == ["Queued at exit"]
+    reopened.close()
+
+def test_journal_imports_legacy_json_and_pages(tmp_path):
+    legacy_path = tmp_path / "journal.json"
+    legacy = [ResearchEntry(intention=f"Old {i}", mode="iterative", tags=["old"]).model_dump() for i in range(5)]
+    legacy_path.write_text(json.dumps(legacy))
+
+    journal = ResearchJournal(storage_path=str(tmp_path / "journal.db"))
+
+    assert not legacy_path.exists() and (tmp_path / "journal.json.bak").exists()
+    assert journal.count() == 5
+    assert [e.intention for e in journal.get_entries(limit=2, offset=3)] == ["Old 3", "Old 4"]
+    assert journal.get_entries(tag="old", limit=1)[0].tags == ["old"]
+
+    journal.clear()
+    assert journal.get_entries() == []
 
 def test_academic_exporter_latex():
     insights = """### Core Logic
@@ -0,0 +1,28 @@
+import pytest
+from src.features.response_cache import ResponseCache, make_cache_key
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(path=str(tmp_path / "cache" / "responses.db"))
+
+def test_cache_roundtrip(cache):
+    key = make_cache_key("model", "one-shot", "intention", "raw")
+    assert cache.get(key) is None
+    cache.set(key, "optimized")
+    assert cache.get(key) == "optimized"
+
+def test_cache_key_is_order_sensitive():
+    assert make_cache_key("a", "b") != make_cache_key("b", "a")
+
+def test_cache_key_keeps_part_boundaries():
+    assert make_cache_key("a|b", "c") != make_cache_key("a", "b|c")
+    assert make_cache_key("ab", "") != make_cache_key("a", "b")
+
+def test_cache_expiry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "responses.db"), ttl=-1)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+def test_cache_disabled_by_env(monkeypatch):
+    monkeypatch.setenv("PROMPT_CACHE_DISABLE", "1")
+    assert ResponseCache.from_env() is None
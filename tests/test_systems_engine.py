@@ -1,7 +1,7 @@
 import pytest
 import asyncio
 from unittest.mock import MagicMock, AsyncMock
-from src.systems_engine import SystemsEngine, EngineState, ValidationError, ComponentError
+from src.systems_engine import SystemsEngine, SystemContext, EngineState, ValidationError, ComponentError, StateError
 
 @pytest.fixture
 def mock_llm_client():
@@ -102,3 +102,219 @@ def test_systems_engine_sync_initialization():
         assert health['status'] == "OPERATIONAL"
     except Exception as e:
         pytest.fail(f"Initialization failed: {e}")
+
+@pytest.mark.asyncio
+async def test_persona_resolution_overlaps_clarification(mock_llm_client):
+    """
+    Persona/complexity are requested while the clarifier is still running.
+    """
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    clarifier_started = asyncio.Event()
+    profile_started_during_clarification = []
+
+    async def slow_questions(intention):
+        clarifier_started.set()
+        await asyncio.sleep(0.05)
+        return ["Which platform?"]
+
+    async def profile(intention, answers):
+        await clarifier_started.wait()
+        profile_started_during_clarification.append(True)
+        return "Systems Architect", "High"
+
+    engine.clarifier.generate_questions = slow_questions
+    engine.builder.suggest_persona_and_complexity = profile
+    engine.builder.build_prompt = AsyncMock(return_value=("Final prompt", []))
+
+    result = await engine.run_pipeline("Build a CLI tool for file management in Python.", mode="one-shot")
+
+    assert result.state == EngineState.COMPLETED
+    assert profile_started_during_clarification
+    kwargs = engine.builder.build_prompt.call_args.kwargs
+    assert kwargs["persona"] == "Systems Architect"
+    assert kwargs["complexity"] == "High"
+
+@pytest.mark.asyncio
+async def test_phase_metrics_derived_from_marks(mock_llm_client):
+    """
+    Phase durations come from one set of boundary marks and never exceed the total.
+    """
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    result = await engine.run_pipeline("Build a CLI tool for file management in Python.", mode="one-shot")
+
+    m = result.metrics
+    assert result.state == EngineState.COMPLETED
+    assert m.clarification_ms > 0 and m.building_ms > 0
+    assert m.initialization_ms + m.validation_ms + m.clarification_ms + m.building_ms <= m.total_duration_ms
+
+@pytest.mark.asyncio
+async def test_llm_concurrency_is_bounded(mock_llm_client):
+    """
+    Concurrent pipelines never have more LLM-bound steps in flight than the engine allows.
+    """
+    engine = SystemsEngine(llm_client=mock_llm_client, max_llm_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def slow_questions(intention):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return []
+
+    engine.clarifier.generate_questions = slow_questions
+    engine.builder.suggest_persona_and_complexity = AsyncMock(return_value=("Engineer", "Low"))
+    engine.builder.build_prompt = AsyncMock(return_value=("Final prompt", []))
+
+    results = await asyncio.gather(*[
+        engine.run_pipeline("Build a CLI tool for file management in Python.", mode="one-shot")
+        for _ in range(6)
+    ])
+
+    assert all(r.state == EngineState.COMPLETED for r in results)
+    assert peak <= 2
+    assert max(r.metrics.llm_in_flight for r in results) == 2
+
+@pytest.mark.asyncio
+async def test_repeat_request_served_from_result_cache(mock_llm_client):
+    """
+    An identical second request completes without reaching the clarifier or builder.
+    """
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    engine.builder.build_prompt = AsyncMock(return_value=("Final prompt", []))
+    intention = "Build a CLI tool for file management in Python."
+
+    first = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+    second = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+    other_mode = await engine.run_pipeline(intention, mode="iterative", answers=["Linux"])
+
+    assert first.state == second.state == other_mode.state == EngineState.COMPLETED
+    assert second.final_prompt == "Final prompt"
+    assert second.metadata.get("result_cache_hit") is True
+    assert "result_cache_hit" not in other_mode.metadata
+    assert engine.builder.build_prompt.await_count == 2
+
+def test_illegal_transition_raises_state_error(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    context = SystemContext(intention="Build a CLI tool for file management.")
+
+    engine._update_state(context, EngineState.INITIALIZING)
+    with pytest.raises(StateError):
+        engine._update_state(context, EngineState.COMPLETED)
+    assert context.state == EngineState.INITIALIZING
+
+@pytest.mark.parametrize("intention, rejected", [
+    (" ".join(["spam"] * 30), True),
+    (" ".join(["spam"] * 28 + ["a"]), True),
+    (" ".join(["spam"] * 27 + ["a", "b"]), False),
+])
+def test_repetitive_intention_detection(mock_llm_client, intention, rejected):
+    """
+    The bot-detection cutoff stays at a unique-word ratio of 0.1 (2 distinct words in 29 fail, 3 pass).
+    """
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    context = SystemContext(intention=intention)
+    if rejected:
+        with pytest.raises(ValidationError):
+            engine._perform_deep_validation(context)
+    else:
+        engine._perform_deep_validation(context)
+
+@pytest.mark.asyncio
+async def test_error_trace_timestamps_formatted_on_serialization(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    result = await engine.run_pipeline("Valid intention here", mode="invalid-mode")
+
+    entry = result.error_trace[-1]
+    assert isinstance(entry["timestamp_ns"], int)
+    assert "timestamp" not in entry
+    dumped = result.model_dump()["error_trace"][-1]
+    assert dumped["timestamp"].endswith("+00:00")
+
+@pytest.mark.asyncio
+async def test_step_timeout_fails_pipeline(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    engine.STEP_TIMEOUT = 0.01
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    engine.builder.build_prompt = hang
+    result = await engine.run_pipeline("Build a CLI tool for file management in Python.", answers=["Linux"])
+
+    assert result.state == EngineState.FAILED
+    assert result.error_trace[-1]["type"] == "ExecutionTimeoutError"
+
+@pytest.mark.asyncio
+async def test_run_pipeline_batch_preserves_order(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    intentions = [
+        "Build a CLI tool for file management in Python.",
+        "",
+        "Design a REST API for a todo application in Go.",
+    ]
+
+    results = await engine.run_pipeline_batch(intentions, mode="one-shot", answers=["Linux"])
+
+    assert [r.state for r in results] == [EngineState.COMPLETED, EngineState.FAILED, EngineState.COMPLETED]
+    assert results[2].intention == intentions[2]
+
+@pytest.mark.asyncio
+async def test_security_scan_reused_for_identical_intention(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    engine.security.process_content = AsyncMock(wraps=engine.security.process_content)
+    intention = "Build a CLI tool for file management in Python 3.11."
+
+    first = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+    second = await engine.run_pipeline(intention, mode="iterative", answers=["Linux"])
+
+    assert first.state == second.state == EngineState.COMPLETED
+    assert engine.security.process_content.await_count == 1
+
+@pytest.mark.asyncio
+async def test_security_metrics_serialized_on_dump(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    result = await engine.run_pipeline("Build a CLI tool for file management in Python.", answers=["Linux"])
+
+    dumped = result.model_dump(mode="json")["metadata"]["security_metrics"]
+    assert isinstance(dumped, dict)
+    assert "scanning_ms" in dumped
+
+def test_performance_metrics_is_slotted():
+    metrics = SystemContext(intention="Build a CLI tool for file management.").metrics
+    metrics.building_ms = 1.5
+    with pytest.raises(AttributeError):
+        metrics.unknown_ms = 1.0
+    assert metrics.to_dict()["building_ms"] == 1.5
+
+@pytest.mark.asyncio
+async def test_soft_failed_optimization_not_result_cached(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+    engine.builder.build_prompt = AsyncMock(return_value=("/* Optimization Failed or Timed Out: down */\n\nraw", []))
+    intention = "Build a CLI tool for file management in Python."
+
+    await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+    second = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+
+    assert "result_cache_hit" not in second.metadata
+    assert engine.builder.build_prompt.await_count == 2
+
+@pytest.mark.asyncio
+async def test_builder_fallback_not_result_cached(mock_llm_client):
+    engine = SystemsEngine(llm_client=mock_llm_client)
+
+    async def fallback_build(*args, on_fallback=None, **kwargs):
+        on_fallback()
+        return "# MISSION\nUnoptimized template", []
+
+    engine.builder.build_prompt = AsyncMock(side_effect=fallback_build)
+    intention = "Build a CLI tool for file management in Python."
+
+    first = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+    second = await engine.run_pipeline(intention, mode="one-shot", answers=["Linux"])
+
+    assert first.state == EngineState.COMPLETED
+    assert "result_cache_hit" not in second.metadata
+    assert engine.builder.build_prompt.await_count == 2